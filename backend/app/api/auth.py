@@ -1,5 +1,7 @@
-import re
 from fastapi import APIRouter, Depends, HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.db.database import get_db
@@ -8,29 +10,47 @@ from app.api.schemas import (
     UserCreate,
     UserLogin,
     Token,
-    UserResponse,
     MeResponse,
-    ChurchResponse,
-    PodcastSettingsResponse,
 )
 from app.api.deps import get_current_user
+from app.utils import slugify
 from app.services.auth_service import (
     get_user_by_email,
-    create_user,
+    get_password_hash,
     authenticate_user,
     create_access_token,
 )
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+_MeAdapter = TypeAdapter(MeResponse)
 
 def generate_slug(name: str) -> str:
     """Generate a URL-friendly slug from a church name."""
-    slug = name.lower()
-    slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-    slug = re.sub(r'[\s_]+', '-', slug)
-    slug = re.sub(r'-+', '-', slug)
-    return slug.strip('-')
+    return slugify(name).strip('-')
+
+
+def next_available_slug(db: Session, base_slug: str) -> str:
+    """
+    Find the first free slug of the form base, base-1, base-2, ...
+
+    Fetches every taken variant in one query and picks the next suffix
+    locally instead of probing the database once per candidate.
+    """
+    taken = {
+        row[0] for row in db.query(Church.slug).filter(
+            or_(Church.slug == base_slug, Church.slug.like(f"{base_slug}-%"))
+        ).all()
+    }
+    if base_slug not in taken:
+        return base_slug
+
+    prefix = f"{base_slug}-"
+    suffixes = [
+        int(slug[len(prefix):]) for slug in taken
+        if slug.startswith(prefix) and slug[len(prefix):].isdigit()
+    ]
+    return f"{base_slug}-{max(suffixes, default=0) + 1}"
 
 
 @router.post("/register", response_model=Token)
@@ -44,33 +64,32 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             detail="Email already registered"
         )
 
-    # Create user
-    user = create_user(db, user_data.email, user_data.password)
-
-    # Create church for user
-    slug = generate_slug(user_data.church_name)
-    # Ensure slug is unique
-    base_slug = slug
-    counter = 1
-    while db.query(Church).filter(Church.slug == slug).first():
-        slug = f"{base_slug}-{counter}"
-        counter += 1
-
-    church = Church(
-        owner_id=user.id,
-        name=user_data.church_name,
-        slug=slug
-    )
-    db.add(church)
+    # Create the user, church and default podcast settings in a single
+    # transaction; the relationships let the unit of work order the inserts
+    # and fill in the foreign keys. The unique constraint on churches.slug
+    # catches a concurrent registration taking the same slug; retry once
+    # with a freshly computed suffix.
+    password_hash = get_password_hash(user_data.password)
+    base_slug = generate_slug(user_data.church_name)
+    for attempt in range(2):
+        user = User(email=user_data.email, password_hash=password_hash)
+        user.church = Church(
+            name=user_data.church_name,
+            slug=next_available_slug(db, base_slug),
+            podcast_settings=PodcastSettings(
+                title=f"{user_data.church_name} Sermons",
+                author=user_data.church_name,
+            )
+        )
+        db.add(user)
 
-    # Create default podcast settings
-    podcast_settings = PodcastSettings(
-        church_id=church.id,
-        title=f"{user_data.church_name} Sermons",
-        author=user_data.church_name,
-    )
-    db.add(podcast_settings)
-    db.commit()
+        try:
+            db.commit()
+            break
+        except IntegrityError:
+            db.rollback()
+            if attempt:
+                raise
 
     # Generate access token
     access_token = create_access_token(data={"sub": user.id})
@@ -95,15 +114,16 @@ def login(credentials: UserLogin, db: Session = Depends(get_db)):
 @router.get("/me", response_model=MeResponse)
 def get_me(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get the current user's profile, church, and podcast settings."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    podcast_settings = None
-    if church:
-        podcast_settings = db.query(PodcastSettings).filter(
-            PodcastSettings.church_id == church.id
-        ).first()
-
-    return MeResponse(
-        user=UserResponse.model_validate(current_user),
-        church=ChurchResponse.model_validate(church) if church else None,
-        podcast_settings=PodcastSettingsResponse.model_validate(podcast_settings) if podcast_settings else None,
+    # The church and its podcast settings are joined-loaded with the user
+    church = current_user.church
+    podcast_settings = church.podcast_settings if church else None
+
+    # Nested user/church/settings models are validated in a single pass
+    return _MeAdapter.validate_python(
+        {
+            "user": current_user,
+            "church": church,
+            "podcast_settings": podcast_settings,
+        },
+        from_attributes=True
     )
@@ -1,11 +1,13 @@
 from typing import Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+import httpx
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload
 
 from app.db.database import get_db
-from app.models import User
+from app.models import User, Church
 from app.services.auth_service import decode_token, get_user_by_id
 
 security = HTTPBearer()
@@ -34,7 +36,11 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = get_user_by_id(db, user_id)
+    # Load the user's church (and its podcast settings) in the same query,
+    # so get_current_church needs no extra round trip
+    user = db.scalar(
+        select(User).options(joinedload(User.church)).where(User.id == user_id)
+    )
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -70,3 +76,33 @@ def get_current_user_optional(
         return None
 
     return get_user_by_id(db, user_id)
+
+
+def get_current_church(current_user: User = Depends(get_current_user)) -> Church:
+    """
+    Get the church owned by the current user, or raise 404.
+
+    The church is joined-loaded with the user, and FastAPI resolves this
+    dependency once per request however many routes or helpers use it.
+    """
+    church = current_user.church
+    if not church:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Church not found"
+        )
+
+    return church
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Get the app-wide async HTTP client created at startup."""
+    return request.app.state.http
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches the ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return etag in (tag.strip() for tag in if_none_match.split(","))
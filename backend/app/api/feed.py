@@ -4,123 +4,313 @@ Serves RSS feeds for podcast distribution.
 These endpoints are PUBLIC (no authentication required).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import Response
+from functools import partial
+from hashlib import blake2b
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import Response, StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.db.database import get_db
-from app.models import Church, PodcastSettings, Sermon, SermonStatus
+from app.db.database import SessionLocal, get_db
+from app.models import Church, Sermon, SermonStatus, sermon_slug
+from app.api.deps import etag_matches
 from app.services.rss_generator import generate_rss_feed
+from app.services.cache_service import FEED_CACHE_TTL, cache_get, cache_set, feed_cache_key
 from app.config import get_settings
 
 router = APIRouter(prefix="/feed", tags=["feed"])
 settings = get_settings()
 
+FEED_CACHE_CONTROL = "public, max-age=3600"  # Cache for 1 hour
 
-@router.get("/{church_slug}.xml")
-def get_podcast_feed(
-    church_slug: str,
-    db: Session = Depends(get_db)
-):
-    """
-    Get the RSS feed for a church's podcast.
-    
-    This is the URL that Apple Podcasts, Spotify, etc. will use.
-    Example: https://preachcaster.com/feed/cross-connection.xml
-    """
-    # Find church by slug
+# Columns the feed renderers read; selecting only these returns plain rows
+# instead of fully hydrated Sermon objects
+FEED_SERMON_COLUMNS = (
+    Sermon.id,
+    Sermon.title,
+    Sermon.summary,
+    Sermon.description,
+    Sermon.big_idea,
+    Sermon.audio_url,
+    Sermon.duration_seconds,
+    Sermon.youtube_video_id,
+    Sermon.status,
+    Sermon.sermon_date,
+    Sermon.published_at,
+    Sermon.created_at,
+)
+
+
+def _published_sermons_filter(church_id: int) -> tuple:
+    """Filter criteria for sermons that appear in a church's public feeds."""
+    return (
+        Sermon.church_id == church_id,
+        Sermon.status == SermonStatus.PUBLISHED.value,
+        Sermon.audio_url.isnot(None)
+    )
+
+
+def _get_feed_church(db: Session, church_slug: str) -> Church:
+    """Load a church and its podcast settings by slug, or raise 404."""
+    # Podcast settings are joined-loaded with the church
     church = db.query(Church).filter(Church.slug == church_slug).first()
     if not church:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Church not found"
         )
-    
-    # Get podcast settings
-    podcast_settings = db.query(PodcastSettings).filter(
-        PodcastSettings.church_id == church.id
-    ).first()
-    
-    if not podcast_settings:
+
+    if not church.podcast_settings:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Podcast not configured"
         )
-    
-    # Get published sermons with audio
-    sermons = db.query(Sermon).filter(
-        Sermon.church_id == church.id,
-        Sermon.status == SermonStatus.PUBLISHED.value,
-        Sermon.audio_url.isnot(None)
-    ).order_by(Sermon.sermon_date.desc()).limit(500).all()
-    
-    # Generate RSS feed
-    base_url = settings.frontend_url or "https://preachcaster.com"
-    feed_xml = generate_rss_feed(church, podcast_settings, sermons, base_url)
-    
+
+    return church
+
+
+def _compute_feed_etag(db: Session, church: Church, fmt: str) -> str:
+    """
+    Build a weak ETag for a church's feed from its change timestamps.
+
+    Combines the newest published sermon update, the published sermon
+    count (so deletions change the tag) and the church/podcast settings
+    update times. Costs one MAX/COUNT query instead of a full render.
+    """
+    latest_update, sermon_count = db.query(
+        func.max(Sermon.updated_at),
+        func.count(Sermon.id)
+    ).filter(*_published_sermons_filter(church.id)).one()
+
+    stamp = "|".join([
+        fmt,
+        str(latest_update),
+        str(sermon_count),
+        str(church.updated_at),
+        str(church.podcast_settings.updated_at),
+    ])
+    return f'W/"{blake2b(stamp.encode(), digest_size=8).hexdigest()}"'
+
+
+def _not_modified(etag: str) -> Response:
+    """Empty 304 response for a client that already has the current feed."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": FEED_CACHE_CONTROL}
+    )
+
+
+def _rss_response(feed_xml: str | bytes, etag: str) -> Response:
+    """Wrap rendered feed XML in a cacheable RSS response."""
     return Response(
         content=feed_xml,
         media_type="application/rss+xml",
         headers={
             "Content-Type": "application/rss+xml; charset=utf-8",
-            "Cache-Control": "public, max-age=3600"  # Cache for 1 hour
+            "Cache-Control": FEED_CACHE_CONTROL,
+            "ETag": etag
         }
     )
 
 
+@router.get("/{church_slug}.xml")
+def get_podcast_feed(
+    church_slug: str,
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the RSS feed for a church's podcast.
+
+    This is the URL that Apple Podcasts, Spotify, etc. will use.
+    Example: https://preachcaster.com/feed/cross-connection.xml
+
+    Rendered XML and its ETag are cached in Redis and invalidated when the
+    church's sermons or podcast settings change. Clients sending a matching
+    If-None-Match get an empty 304.
+    """
+    cache_key = feed_cache_key(church_slug, "xml")
+    etag_key = feed_cache_key(church_slug, "xml:etag")
+
+    cached_etag = cache_get(etag_key)
+    if cached_etag is not None:
+        etag = cached_etag.decode()
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        cached = cache_get(cache_key)
+        if cached is not None:
+            return _rss_response(cached, etag)
+
+    church = _get_feed_church(db, church_slug)
+    etag = _compute_feed_etag(db, church, "xml")
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+
+    feed_xml = _render_podcast_feed(db, church, etag)
+    return _rss_response(feed_xml, etag)
+
+
+def _render_podcast_feed(db: Session, church: Church, etag: str) -> str:
+    """Render a church's RSS feed and cache it alongside its ETag."""
+    # Get published sermons with audio
+    sermons = db.execute(
+        select(*FEED_SERMON_COLUMNS)
+        .where(*_published_sermons_filter(church.id))
+        .order_by(Sermon.sermon_date.desc())
+        .limit(500)
+    ).all()
+
+    # Generate RSS feed
+    base_url = settings.frontend_url or "https://preachcaster.com"
+    feed_xml = generate_rss_feed(
+        church, church.podcast_settings, sermons, base_url, pretty=settings.debug
+    )
+    cache_set(feed_cache_key(church.slug, "xml"), feed_xml, FEED_CACHE_TTL)
+    cache_set(feed_cache_key(church.slug, "xml:etag"), etag, FEED_CACHE_TTL)
+
+    return feed_xml
+
+
+def get_podcast_feed_xml(db: Session, church: Church) -> bytes:
+    """
+    Get a church's public RSS feed as served at /feed/{slug}.xml.
+
+    Returns the cached render when there is one, otherwise renders and
+    caches it. The church must have podcast settings.
+    """
+    cached = cache_get(feed_cache_key(church.slug, "xml"))
+    if cached is not None:
+        return cached
+
+    etag = _compute_feed_etag(db, church, "xml")
+    return _render_podcast_feed(db, church, etag).encode()
+
+
+# Columns for feed.json episodes, in the order _row_to_episode unpacks them
+EPISODE_COLUMNS = (
+    Sermon.id,
+    Sermon.title,
+    Sermon.summary,
+    Sermon.audio_url,
+    Sermon.duration_seconds,
+    Sermon.sermon_date,
+)
+
+
+def _row_to_episode(row: tuple, episode_prefix: str) -> dict:
+    """Build a feed.json episode dict from an EPISODE_COLUMNS row."""
+    sermon_id, title, summary, audio_url, duration_seconds, sermon_date = row
+    return {
+        "id": sermon_id,
+        "title": title,
+        "summary": summary,
+        "audio_url": audio_url,
+        "duration_seconds": duration_seconds,
+        "published_at": sermon_date.isoformat() if sermon_date else None,
+        "url": episode_prefix + sermon_slug(title, sermon_id)
+    }
+
+
+def _stream_podcast_json(
+    church_id: int,
+    church_slug: str,
+    podcast: dict,
+    base_url: str,
+    etag: str
+):
+    """Stream the podcast JSON document, caching the encoded bytes once complete."""
+    parts = []
+    for part in _iter_podcast_json(church_id, church_slug, podcast, base_url):
+        parts.append(part)
+        yield part
+
+    # Only a fully streamed document is cached
+    cache_set(feed_cache_key(church_slug, "json"), b"".join(parts), FEED_CACHE_TTL)
+    cache_set(feed_cache_key(church_slug, "json:etag"), etag, FEED_CACHE_TTL)
+
+
+def _iter_podcast_json(church_id: int, church_slug: str, podcast: dict, base_url: str):
+    """
+    Yield the podcast JSON document incrementally.
+
+    Episode rows are read from a server-side cursor and encoded one at a
+    time, so no ORM objects or episode dicts are held for the whole list.
+    Uses its own session because the request-scoped one is closed before
+    the body is streamed.
+    """
+    yield b'{"podcast":' + orjson.dumps(podcast) + b',"episodes":['
+
+    to_episode = partial(
+        _row_to_episode,
+        episode_prefix=f"{base_url}/{church_slug}/sermons/"
+    )
+
+    count = 0
+    with SessionLocal() as db:
+        rows = db.execute(
+            select(*EPISODE_COLUMNS)
+            .where(*_published_sermons_filter(church_id))
+            .order_by(Sermon.sermon_date.desc())
+            .limit(50)
+            .execution_options(yield_per=50)
+        )
+
+        for encoded in map(orjson.dumps, map(to_episode, rows)):
+            if count:
+                yield b","
+            yield encoded
+            count += 1
+
+    yield b'],"episode_count":' + str(count).encode() + b"}"
+
+
 @router.get("/{church_slug}.json")
 def get_podcast_json(
     church_slug: str,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get podcast info as JSON (for embeds/widgets).
+
+    The response is streamed so the first bytes ship before all episodes
+    have been serialized. Supports the same ETag/304 handling as the
+    RSS feed.
     """
-    church = db.query(Church).filter(Church.slug == church_slug).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-    
-    podcast_settings = db.query(PodcastSettings).filter(
-        PodcastSettings.church_id == church.id
-    ).first()
-    
-    if not podcast_settings:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Podcast not configured"
-        )
-    
-    sermons = db.query(Sermon).filter(
-        Sermon.church_id == church.id,
-        Sermon.status == SermonStatus.PUBLISHED.value,
-        Sermon.audio_url.isnot(None)
-    ).order_by(Sermon.sermon_date.desc()).limit(50).all()
-    
+    etag_key = feed_cache_key(church_slug, "json:etag")
+    cached_etag = cache_get(etag_key)
+    if cached_etag is not None:
+        etag = cached_etag.decode()
+        if etag_matches(request, etag):
+            return _not_modified(etag)
+        cached = cache_get(feed_cache_key(church_slug, "json"))
+        if cached is not None:
+            return Response(
+                content=cached,
+                media_type="application/json",
+                headers={"ETag": etag}
+            )
+
+    church = _get_feed_church(db, church_slug)
+    etag = _compute_feed_etag(db, church, "json")
+    if etag_matches(request, etag):
+        return _not_modified(etag)
+
+    podcast_settings = church.podcast_settings
     base_url = settings.frontend_url or "https://preachcaster.com"
-    
-    return {
-        "podcast": {
-            "title": podcast_settings.title,
-            "description": podcast_settings.description,
-            "author": podcast_settings.author,
-            "artwork_url": podcast_settings.artwork_url,
-            "feed_url": f"{base_url}/feed/{church.slug}.xml",
-            "website_url": podcast_settings.website_url or f"{base_url}/{church.slug}"
-        },
-        "episodes": [
-            {
-                "id": sermon.id,
-                "title": sermon.title,
-                "summary": sermon.summary,
-                "audio_url": sermon.audio_url,
-                "duration_seconds": sermon.duration_seconds,
-                "published_at": sermon.sermon_date.isoformat() if sermon.sermon_date else None,
-                "url": f"{base_url}/{church.slug}/sermons/{sermon.slug}"
-            }
-            for sermon in sermons
-        ],
-        "episode_count": len(sermons)
+    podcast = {
+        "title": podcast_settings.title,
+        "description": podcast_settings.description,
+        "author": podcast_settings.author,
+        "artwork_url": podcast_settings.artwork_url,
+        "feed_url": f"{base_url}/feed/{church.slug}.xml",
+        "website_url": podcast_settings.website_url or f"{base_url}/{church.slug}"
     }
+
+    return StreamingResponse(
+        _stream_podcast_json(church.id, church.slug, podcast, base_url, etag),
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
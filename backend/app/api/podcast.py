@@ -3,6 +3,9 @@ Podcast API Endpoints
 Handles RSS feeds and podcast settings.
 """
 
+from hashlib import blake2b
+
+import orjson
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import Response
 from sqlalchemy.orm import Session
@@ -10,9 +13,17 @@ from pydantic import BaseModel
 from typing import Optional
 
 from app.db.database import get_db
-from app.models import User, Church, PodcastSettings, Sermon, SermonStatus
-from app.api.deps import get_current_user
-from app.services.rss_generator import generate_rss_feed, validate_feed
+from app.models import Church
+from app.api.deps import get_current_church
+from app.api.feed import get_podcast_feed_xml
+from app.services.rss_generator import validate_feed
+from app.services.cache_service import (
+    FEED_VALIDATION_CACHE_TTL,
+    cache_get,
+    cache_set,
+    feed_validation_cache_key,
+    invalidate_feed_cache
+)
 from app.config import get_settings
 
 router = APIRouter(prefix="/podcast", tags=["podcast"])
@@ -52,21 +63,11 @@ class PodcastSettingsResponse(BaseModel):
 
 @router.get("/settings", response_model=PodcastSettingsResponse)
 def get_podcast_settings(
-    current_user: User = Depends(get_current_user),
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """Get podcast settings for the current user's church."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    podcast_settings = db.query(PodcastSettings).filter(
-        PodcastSettings.church_id == church.id
-    ).first()
-
+    podcast_settings = church.podcast_settings
     if not podcast_settings:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -94,21 +95,11 @@ def get_podcast_settings(
 @router.put("/settings", response_model=PodcastSettingsResponse)
 def update_podcast_settings(
     updates: PodcastSettingsUpdate,
-    current_user: User = Depends(get_current_user),
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """Update podcast settings."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    podcast_settings = db.query(PodcastSettings).filter(
-        PodcastSettings.church_id == church.id
-    ).first()
-
+    podcast_settings = church.podcast_settings
     if not podcast_settings:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -123,6 +114,7 @@ def update_podcast_settings(
 
     db.commit()
     db.refresh(podcast_settings)
+    invalidate_feed_cache(church.slug)
 
     base_url = settings.app_url.replace("/api", "")
     feed_url = f"{base_url}/feed/{church.slug}.xml"
@@ -144,43 +136,33 @@ def update_podcast_settings(
 
 @router.get("/validate-feed")
 def validate_podcast_feed(
-    current_user: User = Depends(get_current_user),
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """Validate the podcast RSS feed for issues."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    podcast_settings = db.query(PodcastSettings).filter(
-        PodcastSettings.church_id == church.id
-    ).first()
-
+    podcast_settings = church.podcast_settings
     if not podcast_settings:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Podcast settings not found"
         )
 
-    # Get published sermons
-    sermons = db.query(Sermon).filter(
-        Sermon.church_id == church.id,
-        Sermon.status == SermonStatus.PUBLISHED.value,
-        Sermon.audio_url.isnot(None)
-    ).order_by(Sermon.sermon_date.desc()).limit(100).all()
+    # Validate the feed as served publicly, reusing its cached render. The
+    # result is cached by content hash, so an unchanged feed is not
+    # re-validated.
+    feed_xml = get_podcast_feed_xml(db, church)
+    cache_key = feed_validation_cache_key(blake2b(feed_xml, digest_size=16).hexdigest())
 
-    # Generate feed
-    base_url = settings.app_url.replace("/api", "")
-    feed_xml = generate_rss_feed(church, podcast_settings, sermons, base_url)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return orjson.loads(cached)
 
-    # Validate
-    is_valid, issues = validate_feed(feed_xml)
+    is_valid, issues = validate_feed(feed_xml.decode())
 
-    return {
+    result = {
         "valid": is_valid,
         "issues": issues,
-        "episode_count": len(sermons)
+        "episode_count": feed_xml.count(b"<item>")
     }
+    cache_set(cache_key, orjson.dumps(result), FEED_VALIDATION_CACHE_TTL)
+    return result
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional
 from pydantic import BaseModel, EmailStr
 
 
@@ -111,7 +111,7 @@ class SermonResponse(BaseModel):
 
 
 class SermonDetailResponse(SermonResponse):
-    transcript_json: Optional[List[dict]] = None
+    transcript_json: Optional[dict] = None
     summary: Optional[str] = None
     discussion_guide: Optional[str] = None
 
@@ -6,12 +6,15 @@ CRUD operations for sermons.
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, contains_eager
+from pydantic import BaseModel, TypeAdapter
 
-from app.db.database import get_db
+from app.db.database import SessionLocal, get_db
 from app.models import User, Church, Sermon, SermonStatus
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_current_church
+from app.services.cache_service import invalidate_feed_cache
 from app.workers.tasks import enqueue_sermon_processing
 
 router = APIRouter(prefix="/sermons", tags=["sermons"])
@@ -67,42 +70,104 @@ class SermonListResponse(BaseModel):
     total: int
 
 
-@router.get("", response_model=SermonListResponse)
+# Columns backing SermonResponse; list queries select only these
+_SERMON_RESPONSE_COLUMNS = tuple(
+    getattr(Sermon, field) for field in SermonResponse.model_fields
+)
+
+# Shared validators, built once at import rather than looked up per response
+_SermonAdapter = TypeAdapter(SermonResponse)
+# Whole sermon lists validate in one call instead of one per row
+_SermonListAdapter = TypeAdapter(List[SermonResponse])
+
+
+def _load_sermon_for_user(db: Session, user_id: int, sermon_id: int) -> Sermon:
+    """Load a sermon owned by the user's church in a single joined query."""
+    sermon = db.query(Sermon).join(Church, Sermon.church_id == Church.id).options(
+        contains_eager(Sermon.church)
+    ).filter(
+        Church.owner_id == user_id,
+        Sermon.id == sermon_id
+    ).first()
+
+    if not sermon:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Sermon not found"
+        )
+
+    return sermon
+
+
+def _queue_sermon_processing(sermon_id: int) -> None:
+    """
+    Enqueue a new sermon for processing, recording any failure on the sermon.
+
+    Runs as a background task after the response is sent, so it uses its own
+    session rather than the request-scoped one.
+    """
+    try:
+        enqueue_sermon_processing(sermon_id)
+    except Exception as e:
+        # Log error but don't fail - can be manually triggered later
+        with SessionLocal() as db:
+            db.query(Sermon).filter(Sermon.id == sermon_id).update(
+                {Sermon.error_message: f"Failed to queue for processing: {e}"}
+            )
+            db.commit()
+
+
+@router.get(
+    "",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": SermonListResponse}}
+)
 def list_sermons(
     status_filter: Optional[str] = None,
     limit: int = 50,
     offset: int = 0,
-    current_user: User = Depends(get_current_user),
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """List sermons for the current user's church."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    query = db.query(Sermon).filter(Sermon.church_id == church.id)
+    criteria = [Sermon.church_id == church.id]
 
     if status_filter:
-        query = query.filter(Sermon.status == status_filter)
-
-    total = query.count()
-    sermons = query.order_by(Sermon.sermon_date.desc()).offset(offset).limit(limit).all()
-
-    return SermonListResponse(
-        sermons=[SermonResponse.model_validate(s) for s in sermons],
-        count=len(sermons),
-        total=total
-    )
+        criteria.append(Sermon.status == status_filter)
+
+    # Read-only listing: plain column rows, no ORM identity-map bookkeeping.
+    # The total rides along as a window count, saving a separate COUNT query.
+    sermons = db.execute(
+        select(*_SERMON_RESPONSE_COLUMNS, func.count().over().label("total"))
+        .where(*criteria)
+        .order_by(Sermon.sermon_date.desc())
+        .offset(offset)
+        .limit(limit)
+    ).all()
+
+    if sermons:
+        total = sermons[0].total
+    elif offset:
+        # Paged past the end, so no row carried the total
+        total = db.scalar(select(func.count()).select_from(Sermon).where(*criteria))
+    else:
+        total = 0
+
+    # Items are validated in one batch and dumped once; returning the response
+    # directly skips FastAPI's second validation pass over the whole list
+    validated = _SermonListAdapter.validate_python(sermons, from_attributes=True)
+    return ORJSONResponse({
+        "sermons": _SermonListAdapter.dump_python(validated, mode="json"),
+        "count": len(sermons),
+        "total": total
+    })
 
 
 @router.post("", response_model=SermonResponse, status_code=status.HTTP_201_CREATED)
 def create_sermon(
     sermon_data: SermonCreate,
     background_tasks: BackgroundTasks,
-    current_user: User = Depends(get_current_user),
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """
@@ -110,15 +175,8 @@ def create_sermon(
     
     The sermon will be queued for processing (audio extraction, transcript, AI content).
     """
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    # Check if sermon already exists
-    existing = db.query(Sermon).filter(
+    # Check if sermon already exists (id only, nothing to hydrate)
+    existing = db.query(Sermon.id).filter(
         Sermon.church_id == church.id,
         Sermon.youtube_video_id == sermon_data.youtube_video_id
     ).first()
@@ -147,15 +205,10 @@ def create_sermon(
     db.commit()
     db.refresh(sermon)
 
-    # Queue for processing
-    try:
-        enqueue_sermon_processing(sermon.id)
-    except Exception as e:
-        # Log error but don't fail - can be manually triggered later
-        sermon.error_message = f"Failed to queue for processing: {e}"
-        db.commit()
+    # Queue for processing once the response has been sent
+    background_tasks.add_task(_queue_sermon_processing, sermon.id)
 
-    return SermonResponse.model_validate(sermon)
+    return _SermonAdapter.validate_python(sermon, from_attributes=True)
 
 
 @router.get("/{sermon_id}", response_model=SermonResponse)
@@ -165,25 +218,9 @@ def get_sermon(
     db: Session = Depends(get_db)
 ):
     """Get a specific sermon."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    sermon = db.query(Sermon).filter(
-        Sermon.id == sermon_id,
-        Sermon.church_id == church.id
-    ).first()
-
-    if not sermon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sermon not found"
-        )
+    sermon = _load_sermon_for_user(db, current_user.id, sermon_id)
 
-    return SermonResponse.model_validate(sermon)
+    return _SermonAdapter.validate_python(sermon, from_attributes=True)
 
 
 @router.put("/{sermon_id}", response_model=SermonResponse)
@@ -194,23 +231,7 @@ def update_sermon(
     db: Session = Depends(get_db)
 ):
     """Update sermon metadata."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    sermon = db.query(Sermon).filter(
-        Sermon.id == sermon_id,
-        Sermon.church_id == church.id
-    ).first()
-
-    if not sermon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sermon not found"
-        )
+    sermon = _load_sermon_for_user(db, current_user.id, sermon_id)
 
     # Update only provided fields
     update_data = updates.model_dump(exclude_unset=True)
@@ -220,8 +241,9 @@ def update_sermon(
 
     db.commit()
     db.refresh(sermon)
+    invalidate_feed_cache(sermon.church.slug)
 
-    return SermonResponse.model_validate(sermon)
+    return _SermonAdapter.validate_python(sermon, from_attributes=True)
 
 
 @router.delete("/{sermon_id}")
@@ -231,26 +253,12 @@ def delete_sermon(
     db: Session = Depends(get_db)
 ):
     """Delete a sermon."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    sermon = db.query(Sermon).filter(
-        Sermon.id == sermon_id,
-        Sermon.church_id == church.id
-    ).first()
-
-    if not sermon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sermon not found"
-        )
+    sermon = _load_sermon_for_user(db, current_user.id, sermon_id)
 
+    church_slug = sermon.church.slug
     db.delete(sermon)
     db.commit()
+    invalidate_feed_cache(church_slug)
 
     return {"message": "Sermon deleted"}
 
@@ -262,28 +270,13 @@ def reprocess_sermon(
     db: Session = Depends(get_db)
 ):
     """Requeue a sermon for processing (useful for failed sermons)."""
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-
-    sermon = db.query(Sermon).filter(
-        Sermon.id == sermon_id,
-        Sermon.church_id == church.id
-    ).first()
-
-    if not sermon:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Sermon not found"
-        )
+    sermon = _load_sermon_for_user(db, current_user.id, sermon_id)
 
     # Reset status
     sermon.status = SermonStatus.PENDING.value
     sermon.error_message = None
     db.commit()
+    invalidate_feed_cache(sermon.church.slug)
 
     # Queue for processing
     try:
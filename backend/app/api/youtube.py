@@ -4,26 +4,63 @@ Handles OAuth flow and channel management.
 """
 
 import secrets
-from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.responses import RedirectResponse
+from datetime import datetime
+from hashlib import blake2b
+from urllib.parse import quote
+
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse, RedirectResponse
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
+from redis.exceptions import RedisError
 
 from app.db.database import get_db
 from app.models import User, Church
-from app.api.deps import get_current_user
+from app.api.deps import etag_matches, get_current_user, get_current_church, get_http_client
 from app.config import get_settings
+from app.services.auth_service import (
+    OAUTH_STATE_EXPIRE_MINUTES,
+    create_oauth_state,
+    decode_oauth_state
+)
+from app.services.cache_service import (
+    CHANNEL_INFO_CACHE_TTL,
+    access_token_cache_key,
+    cache_delete,
+    cache_get,
+    cache_set,
+    channel_info_cache_key,
+    get_redis,
+    oauth_nonce_cache_key
+)
 from app.services.youtube_service import (
     get_oauth_url,
     exchange_code_for_tokens,
+    fetch_channel_info,
     get_channel_info,
+    get_valid_access_token,
     list_channel_videos,
+    token_expires_at,
     YouTubeServiceError
 )
 
 router = APIRouter(prefix="/youtube", tags=["youtube"])
 settings = get_settings()
 
+# OAuth redirect URI (must match between authorization and token exchange)
+_REDIRECT_URI = f"{settings.app_url}/api/youtube/callback"
+
+# Frontend pages the OAuth callback redirects to; values must be URL-quoted
+_FRONTEND_URL = settings.frontend_url or "http://localhost:3000"
+_FRONTEND_SUCCESS_TMPL = f"{_FRONTEND_URL}/dashboard/settings?youtube=connected&channel={{title}}"
+_FRONTEND_ERROR_TMPL = f"{_FRONTEND_URL}/dashboard/settings?youtube=error&message={{msg}}"
+
+# Channel info is per user and may be a minute stale
+CHANNEL_CACHE_CONTROL = "private, max-age=60"
+
 
 class YouTubeConnectResponse(BaseModel):
     """Response with OAuth URL for YouTube connection."""
@@ -46,7 +83,7 @@ class YouTubeVideoResponse(BaseModel):
     video_id: str
     title: str
     description: str | None
-    published_at: str | None
+    published_at: datetime | None
     thumbnail_url: str | None
 
 
@@ -56,6 +93,19 @@ class YouTubeVideosResponse(BaseModel):
     count: int
 
 
+def _get_cached_channel_info(db: Session, church: Church) -> dict:
+    """Get info for the church's connected channel, cached briefly in Redis."""
+    cache_key = channel_info_cache_key(church.youtube_channel_id)
+
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return orjson.loads(cached)
+
+    channel_info = get_channel_info(get_valid_access_token(db, church))
+    cache_set(cache_key, orjson.dumps(channel_info), CHANNEL_INFO_CACHE_TTL)
+    return channel_info
+
+
 @router.get("/connect", response_model=YouTubeConnectResponse)
 def start_youtube_connect(
     current_user: User = Depends(get_current_user),
@@ -65,16 +115,13 @@ def start_youtube_connect(
     Start the YouTube OAuth flow.
     
     Returns a URL to redirect the user to for Google authorization.
-    The state token should be stored in the frontend to verify the callback.
+    The state is a short-lived signed token identifying the user, so the
+    callback can store the connection without a second request.
     """
-    # Generate CSRF state token
-    state = secrets.token_urlsafe(32)
-    
-    # Build redirect URI (adjust for production)
-    redirect_uri = f"{settings.app_url}/api/youtube/callback"
+    state = create_oauth_state(current_user.id, secrets.token_urlsafe(16))
     
     # Get authorization URL
-    auth_url = get_oauth_url(redirect_uri, state)
+    auth_url = get_oauth_url(_REDIRECT_URI, state)
     
     return YouTubeConnectResponse(auth_url=auth_url, state=state)
 
@@ -83,150 +130,117 @@ def start_youtube_connect(
 async def youtube_oauth_callback(
     code: str,
     state: str,
+    http: httpx.AsyncClient = Depends(get_http_client),
     db: Session = Depends(get_db)
 ):
     """
     Handle the OAuth callback from Google.
     
     This endpoint is called by Google after the user authorizes.
-    It exchanges the code for tokens and stores the channel info.
-    
-    In production, this should redirect to the frontend with success/error.
+    It verifies the state, exchanges the code for tokens, stores the
+    channel connection on the user's church and redirects to the frontend.
     """
     try:
-        # Build redirect URI (must match what was used in authorization)
-        redirect_uri = f"{settings.app_url}/api/youtube/callback"
-        
-        # Exchange code for tokens
-        tokens = exchange_code_for_tokens(code, redirect_uri)
-        
-        access_token = tokens.get("access_token")
-        refresh_token = tokens.get("refresh_token")
-        
-        if not access_token:
-            raise YouTubeServiceError("No access token received")
-        
-        # Get channel info
-        channel_info = get_channel_info(access_token)
-        
-        # TODO: Store tokens and channel info in database
-        # This requires knowing which user initiated the flow
-        # In production, decode state token to get user_id
-        
-        # For now, redirect to frontend with success
-        frontend_url = settings.frontend_url or "http://localhost:3000"
-        return RedirectResponse(
-            url=f"{frontend_url}/dashboard/settings?youtube=connected&channel={channel_info['title']}"
-        )
+        # The signed state says which user started the flow; each state
+        # can only be used once
+        payload = decode_oauth_state(state)
+        if payload is None:
+            raise YouTubeServiceError("Invalid or expired OAuth state")
+        # Unlike the cache helpers this must fail closed: without Redis a
+        # used state can't be told apart from a fresh one
+        try:
+            first_use = get_redis().set(
+                oauth_nonce_cache_key(payload["nonce"]), 1,
+                ex=OAUTH_STATE_EXPIRE_MINUTES * 60, nx=True
+            )
+        except RedisError:
+            raise YouTubeServiceError("OAuth state could not be verified")
+        if not first_use:
+            raise YouTubeServiceError("OAuth state already used")
         
-    except YouTubeServiceError as e:
-        frontend_url = settings.frontend_url or "http://localhost:3000"
-        return RedirectResponse(
-            url=f"{frontend_url}/dashboard/settings?youtube=error&message={str(e)}"
-        )
-
-
-@router.post("/connect/complete")
-async def complete_youtube_connection(
-    code: str,
-    state: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """
-    Complete the YouTube OAuth flow (alternative to redirect callback).
-    
-    The frontend can call this with the code and state from the URL
-    after the user is redirected back.
-    """
-    try:
-        redirect_uri = f"{settings.app_url}/api/youtube/callback"
+        church = db.scalar(select(Church).where(Church.owner_id == payload["uid"]))
+        if not church:
+            raise YouTubeServiceError("Church not found")
         
         # Exchange code for tokens
-        tokens = exchange_code_for_tokens(code, redirect_uri)
+        tokens = await exchange_code_for_tokens(http, code, _REDIRECT_URI)
         
         access_token = tokens.get("access_token")
         refresh_token = tokens.get("refresh_token")
         
         if not access_token:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No access token received from Google"
-            )
+            raise YouTubeServiceError("No access token received")
         
         # Get channel info
-        channel_info = get_channel_info(access_token)
-        
-        # Get user's church
-        church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-        if not church:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Church not found"
-            )
+        channel_info = await fetch_channel_info(http, access_token)
         
         # Update church with YouTube info
         church.youtube_channel_id = channel_info["channel_id"]
         church.youtube_access_token = access_token
         church.youtube_refresh_token = refresh_token
+        church.youtube_token_expires_at = token_expires_at(tokens.get("expires_in"))
         
         db.commit()
+        cache_set(
+            channel_info_cache_key(channel_info["channel_id"]),
+            orjson.dumps(channel_info),
+            CHANNEL_INFO_CACHE_TTL
+        )
         
-        return YouTubeChannelResponse(
-            channel_id=channel_info["channel_id"],
-            title=channel_info["title"],
-            thumbnail_url=channel_info.get("thumbnail_url"),
-            subscriber_count=channel_info.get("subscriber_count", 0),
-            video_count=channel_info.get("video_count", 0),
-            connected=True
+        return RedirectResponse(
+            url=_FRONTEND_SUCCESS_TMPL.format(title=quote(channel_info["title"]))
         )
         
     except YouTubeServiceError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
+        return RedirectResponse(
+            url=_FRONTEND_ERROR_TMPL.format(msg=quote(str(e)))
         )
 
 
 @router.get("/channel", response_model=YouTubeChannelResponse)
 def get_connected_channel(
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """
     Get the currently connected YouTube channel info.
-    """
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
     
+    Responses carry an ETag of the channel info, so polling clients get
+    an empty 304 while nothing has changed.
+    """
     if not church.youtube_channel_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No YouTube channel connected"
         )
     
-    # Get fresh channel info
+    # Get channel info (cached for a few minutes to spare API quota)
     try:
-        channel_info = get_channel_info(church.youtube_access_token)
-        
-        return YouTubeChannelResponse(
-            channel_id=channel_info["channel_id"],
-            title=channel_info["title"],
-            thumbnail_url=channel_info.get("thumbnail_url"),
-            subscriber_count=channel_info.get("subscriber_count", 0),
-            video_count=channel_info.get("video_count", 0),
-            connected=True
-        )
+        channel_info = _get_cached_channel_info(db, church)
     except YouTubeServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to get channel info: {e}"
         )
+    
+    digest = blake2b(orjson.dumps(channel_info, option=orjson.OPT_SORT_KEYS), digest_size=8)
+    etag = f'W/"{digest.hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": CHANNEL_CACHE_CONTROL}
+    
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return YouTubeChannelResponse(
+        channel_id=channel_info["channel_id"],
+        title=channel_info["title"],
+        thumbnail_url=channel_info.get("thumbnail_url"),
+        subscriber_count=channel_info.get("subscriber_count", 0),
+        video_count=channel_info.get("video_count", 0),
+        connected=True
+    )
 
 
 @router.delete("/disconnect")
@@ -237,40 +251,46 @@ def disconnect_youtube(
     """
     Disconnect the YouTube channel from the church.
     """
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
+    # Clear the connection in a single UPDATE; no need to load the church
+    church_id = db.execute(
+        update(Church)
+        .where(Church.owner_id == current_user.id)
+        .values(
+            youtube_channel_id=None,
+            youtube_access_token=None,
+            youtube_refresh_token=None,
+            youtube_token_expires_at=None
+        )
+        .returning(Church.id)
+    ).scalar_one_or_none()
     
-    if not church:
+    if church_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Church not found"
         )
     
-    church.youtube_channel_id = None
-    church.youtube_access_token = None
-    church.youtube_refresh_token = None
-    
     db.commit()
+    # Cached channel info is keyed by channel and only served while a
+    # channel is connected, so just the token needs dropping
+    cache_delete(access_token_cache_key(church_id))
     
     return {"message": "YouTube channel disconnected"}
 
 
-@router.get("/videos", response_model=YouTubeVideosResponse)
+@router.get(
+    "/videos",
+    response_model=None,
+    responses={status.HTTP_200_OK: {"model": YouTubeVideosResponse}}
+)
 def list_videos(
     max_results: int = 20,
-    current_user: User = Depends(get_current_user),
+    church: Church = Depends(get_current_church),
     db: Session = Depends(get_db)
 ):
     """
     List recent videos from the connected YouTube channel.
     """
-    church = db.query(Church).filter(Church.owner_id == current_user.id).first()
-    
-    if not church:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Church not found"
-        )
-    
     if not church.youtube_channel_id or not church.youtube_access_token:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -279,24 +299,14 @@ def list_videos(
     
     try:
         videos = list_channel_videos(
-            access_token=church.youtube_access_token,
+            access_token=get_valid_access_token(db, church),
             channel_id=church.youtube_channel_id,
             max_results=max_results
         )
         
-        return YouTubeVideosResponse(
-            videos=[
-                YouTubeVideoResponse(
-                    video_id=v["video_id"],
-                    title=v["title"],
-                    description=v.get("description"),
-                    published_at=v["published_at"].isoformat() if v.get("published_at") else None,
-                    thumbnail_url=v.get("thumbnail_url")
-                )
-                for v in videos
-            ],
-            count=len(videos)
-        )
+        # Video dicts already match YouTubeVideoResponse, so they go straight
+        # to orjson (which encodes published_at natively)
+        return ORJSONResponse({"videos": videos, "count": len(videos)})
     except YouTubeServiceError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -8,6 +8,10 @@ class Settings(BaseSettings):
     debug: bool = False
     app_url: str = "http://localhost:8000"  # Backend URL
     frontend_url: str = "http://localhost:3000"  # Frontend URL
+    cors_origins: list[str] = [
+        "http://localhost:3000",  # Next.js dev server
+        "https://preachcaster.com",
+    ]
 
     # Database
     database_url: str = "postgresql://miles@localhost:5432/preachcaster"
@@ -23,11 +27,15 @@ class Settings(BaseSettings):
 
     # OpenAI
     openai_api_key: str = ""
+    openai_max_concurrency: int = 4  # Concurrent requests per pipeline step
 
     # Google Cloud Storage
     gcs_project_id: str = ""
     gcs_bucket_name: str = "preachcaster-audio"
 
+    # Audio processing
+    audio_workers: int = 2  # Concurrent extractions in a batch
+
     # Redis
     redis_url: str = "redis://localhost:6379"
 
@@ -5,7 +5,9 @@ from app.config import get_settings
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url)
+# Recycle connections before Postgres or a proxy drops them as idle;
+# long-running workers otherwise hit a dead pooled connection
+engine = create_engine(settings.database_url, pool_recycle=1800)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
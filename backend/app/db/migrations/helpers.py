@@ -0,0 +1,27 @@
+"""
+Migration Helpers
+Shared operations for Alembic revisions.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def drop_index_if_invalid(index_name: str, table_name: str) -> None:
+    """
+    Drop the index if an earlier concurrent build left it INVALID.
+
+    A failed CREATE INDEX CONCURRENTLY (lock timeout, duplicate key) leaves
+    an unusable index behind under the same name, which would make the
+    build fail again or, with IF NOT EXISTS, be skipped.
+    """
+    invalid = op.get_bind().execute(sa.text(
+        "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+    ), {"name": index_name}).scalar()
+    if invalid:
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,46 @@
+"""Add (church_id, sermon_date DESC) index on sermons
+
+Revision ID: 2d6f8a1c3e94
+Revises: 9b7d2c4e1f60
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations.helpers import drop_index_if_invalid
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2d6f8a1c3e94'
+down_revision: Union[str, None] = '9b7d2c4e1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build without locking out writes (see 3bce923898d6)
+    with op.get_context().autocommit_block():
+        drop_index_if_invalid('ix_sermons_church_date', 'sermons')
+        op.execute("SET lock_timeout = '2s'")
+        try:
+            op.create_index(
+                'ix_sermons_church_date',
+                'sermons',
+                ['church_id', sa.text('sermon_date DESC')],
+                postgresql_concurrently=True
+            )
+        finally:
+            op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sermons_church_date',
+            table_name='sermons',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
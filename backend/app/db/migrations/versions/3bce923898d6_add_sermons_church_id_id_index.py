@@ -0,0 +1,49 @@
+"""Add composite (church_id, id) index on sermons
+
+Revision ID: 3bce923898d6
+Revises: 165655e61514
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations.helpers import drop_index_if_invalid
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3bce923898d6'
+down_revision: Union[str, None] = '165655e61514'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build without locking out writes; CONCURRENTLY can't run in a
+    # transaction, and the lock timeout stops the build queueing behind
+    # long-running queries
+    with op.get_context().autocommit_block():
+        drop_index_if_invalid('ix_sermons_church_id_id', 'sermons')
+        op.execute("SET lock_timeout = '2s'")
+        try:
+            op.create_index(
+                'ix_sermons_church_id_id',
+                'sermons',
+                ['church_id', 'id'],
+                postgresql_concurrently=True
+            )
+        finally:
+            # The setting is per session, and later migrations share it
+            op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sermons_church_id_id',
+            table_name='sermons',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,75 @@
+"""Store sermon transcripts as JSONB parallel arrays
+
+Converts sermons.transcript_json from JSON to JSONB and rewrites each
+transcript from a list of {"start", "duration", "text"} entries into
+{"starts": [...], "durations": [...], "texts": [...]}.
+
+Revision ID: 5e0b9a3f7c12
+Revises: c41d7e9a5b23
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0b9a3f7c12'
+down_revision: Union[str, None] = 'c41d7e9a5b23'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'sermons',
+        'transcript_json',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        existing_nullable=True,
+        postgresql_using='transcript_json::jsonb'
+    )
+    op.execute("""
+        UPDATE sermons SET transcript_json = jsonb_build_object(
+            'starts', COALESCE((
+                SELECT jsonb_agg(e->'start' ORDER BY i)
+                FROM jsonb_array_elements(transcript_json) WITH ORDINALITY AS t(e, i)
+            ), '[]'::jsonb),
+            'durations', COALESCE((
+                SELECT jsonb_agg(e->'duration' ORDER BY i)
+                FROM jsonb_array_elements(transcript_json) WITH ORDINALITY AS t(e, i)
+            ), '[]'::jsonb),
+            'texts', COALESCE((
+                SELECT jsonb_agg(e->'text' ORDER BY i)
+                FROM jsonb_array_elements(transcript_json) WITH ORDINALITY AS t(e, i)
+            ), '[]'::jsonb)
+        )
+        WHERE jsonb_typeof(transcript_json) = 'array'
+    """)
+
+
+def downgrade() -> None:
+    op.execute("""
+        UPDATE sermons SET transcript_json = COALESCE((
+            SELECT jsonb_agg(
+                jsonb_build_object(
+                    'text', transcript_json->'texts'->i,
+                    'start', transcript_json->'starts'->i,
+                    'duration', transcript_json->'durations'->i
+                ) ORDER BY i
+            )
+            FROM generate_series(0, jsonb_array_length(transcript_json->'starts') - 1) AS i
+        ), '[]'::jsonb)
+        WHERE jsonb_typeof(transcript_json) = 'object'
+    """)
+    op.alter_column(
+        'sermons',
+        'transcript_json',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        existing_nullable=True,
+        postgresql_using='transcript_json::json'
+    )
@@ -0,0 +1,47 @@
+"""Add covering index for the public feed query on sermons
+
+Revision ID: 8f2a61c0d4b7
+Revises: 3bce923898d6
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations.helpers import drop_index_if_invalid
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f2a61c0d4b7'
+down_revision: Union[str, None] = '3bce923898d6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Build without locking out writes (see 3bce923898d6)
+    with op.get_context().autocommit_block():
+        drop_index_if_invalid('ix_sermons_feed', 'sermons')
+        op.execute("SET lock_timeout = '2s'")
+        try:
+            op.create_index(
+                'ix_sermons_feed',
+                'sermons',
+                ['church_id', 'status', sa.text('sermon_date DESC')],
+                postgresql_include=['audio_url', 'title', 'summary', 'duration_seconds'],
+                postgresql_concurrently=True
+            )
+        finally:
+            op.execute("RESET lock_timeout")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_sermons_feed',
+            table_name='sermons',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
@@ -0,0 +1,81 @@
+"""Encrypt YouTube OAuth tokens at rest
+
+Converts churches.youtube_access_token and youtube_refresh_token from
+TEXT to BYTEA and encrypts existing tokens with the app's token key
+(see app.db.types).
+
+Revision ID: 9b7d2c4e1f60
+Revises: 5e0b9a3f7c12
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.db.types import decrypt_token, encrypt_token
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b7d2c4e1f60'
+down_revision: Union[str, None] = '5e0b9a3f7c12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TOKEN_COLUMNS = ('youtube_access_token', 'youtube_refresh_token')
+
+
+def _rewrite_tokens(convert) -> None:
+    """Apply convert to every stored token (needs a live connection)."""
+    if context.is_offline_mode():
+        return
+
+    churches = sa.table(
+        'churches',
+        sa.column('id', sa.Integer),
+        *(sa.column(name, sa.LargeBinary) for name in TOKEN_COLUMNS)
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(churches).where(
+            sa.or_(*(churches.c[name].isnot(None) for name in TOKEN_COLUMNS))
+        )
+    ).all()
+    for row in rows:
+        bind.execute(
+            churches.update()
+            .where(churches.c.id == row.id)
+            .values({
+                name: convert(bytes(row._mapping[name]))
+                for name in TOKEN_COLUMNS
+                if row._mapping[name] is not None
+            })
+        )
+
+
+def upgrade() -> None:
+    for name in TOKEN_COLUMNS:
+        op.alter_column(
+            'churches',
+            name,
+            type_=sa.LargeBinary(),
+            existing_type=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f"convert_to({name}, 'UTF8')"
+        )
+    _rewrite_tokens(lambda value: encrypt_token(value.decode()))
+
+
+def downgrade() -> None:
+    # Tokens that can't be decrypted are dropped; the church reconnects
+    _rewrite_tokens(lambda value: (decrypt_token(value) or '').encode() or None)
+    for name in TOKEN_COLUMNS:
+        op.alter_column(
+            'churches',
+            name,
+            type_=sa.Text(),
+            existing_type=sa.LargeBinary(),
+            existing_nullable=True,
+            postgresql_using=f"convert_from({name}, 'UTF8')"
+        )
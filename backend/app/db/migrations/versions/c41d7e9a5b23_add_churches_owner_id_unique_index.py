@@ -0,0 +1,57 @@
+"""Add unique index on churches.owner_id
+
+Revision ID: c41d7e9a5b23
+Revises: 8f2a61c0d4b7
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.db.migrations.helpers import drop_index_if_invalid
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41d7e9a5b23'
+down_revision: Union[str, None] = '8f2a61c0d4b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Each user owns exactly one church; every authenticated request looks
+    # the church up by owner
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT owner_id FROM churches GROUP BY owner_id HAVING count(*) > 1"
+    )).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot add unique index on churches.owner_id: users {duplicates} "
+            "own more than one church. Resolve the duplicates and rerun."
+        )
+
+    # Build without locking out writes (see 3bce923898d6)
+    with op.get_context().autocommit_block():
+        drop_index_if_invalid('ix_churches_owner_id', 'churches')
+        op.execute("SET lock_timeout = '2s'")
+        try:
+            op.create_index(
+                'ix_churches_owner_id',
+                'churches',
+                ['owner_id'],
+                unique=True,
+                postgresql_concurrently=True
+            )
+        finally:
+            op.execute("RESET lock_timeout")
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_churches_owner_id',
+            table_name='churches',
+            postgresql_concurrently=True,
+            if_exists=True
+        )
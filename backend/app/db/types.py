@@ -0,0 +1,72 @@
+"""
+Custom Column Types
+Encrypted storage for OAuth tokens.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from sqlalchemy import LargeBinary
+from sqlalchemy.types import TypeDecorator
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# AES-GCM nonce size; stored as a prefix of each encrypted value
+NONCE_SIZE = 12
+
+
+@lru_cache()
+def _token_cipher() -> AESGCM:
+    """AES-256-GCM cipher keyed from the app secret via HKDF."""
+    key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"preachcaster:oauth-tokens"
+    ).derive(get_settings().jwt_secret.encode())
+    return AESGCM(key)
+
+
+def encrypt_token(token: str) -> bytes:
+    """Encrypt a token as nonce + ciphertext (with GCM tag)."""
+    nonce = os.urandom(NONCE_SIZE)
+    return nonce + _token_cipher().encrypt(nonce, token.encode(), None)
+
+
+def decrypt_token(blob: bytes) -> Optional[str]:
+    """
+    Decrypt a token produced by encrypt_token.
+
+    Returns None if the value can't be decrypted (e.g. the app secret
+    changed), so the church simply has to reconnect YouTube.
+    """
+    try:
+        return _token_cipher().decrypt(blob[:NONCE_SIZE], blob[NONCE_SIZE:], None).decode()
+    except (InvalidTag, ValueError) as e:
+        logger.warning(f"Could not decrypt stored token: {e!r}")
+        return None
+
+
+class EncryptedToken(TypeDecorator):
+    """String column stored AES-GCM encrypted as bytes."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return encrypt_token(value)
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return decrypt_token(bytes(value))
@@ -1,27 +1,44 @@
+from contextlib import asynccontextmanager
+
+import httpx
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.config import get_settings
 from app.api import auth, youtube, podcast, sermons, feed
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared HTTP client for async calls to Google (pooled connections)
+    app.state.http = httpx.AsyncClient(
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=100)
+    )
+    yield
+    await app.state.http.aclose()
+
+
 app = FastAPI(
     title=settings.app_name,
     description="Convert YouTube sermons to podcasts automatically",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
-# CORS - allow frontend to connect
+# CORS - allow frontend to connect. Methods and headers are listed
+# explicitly so browsers can cache preflight responses (max_age).
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",  # Next.js dev server
-        "https://preachcaster.com",
-    ],
+    allow_origins=settings.cors_origins,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    max_age=86400,
 )
 
 
@@ -1,6 +1,6 @@
 from app.models.user import User
 from app.models.church import Church
 from app.models.podcast_settings import PodcastSettings
-from app.models.sermon import Sermon, SermonStatus
+from app.models.sermon import Sermon, SermonStatus, sermon_slug
 
-__all__ = ["User", "Church", "PodcastSettings", "Sermon", "SermonStatus"]
+__all__ = ["User", "Church", "PodcastSettings", "Sermon", "SermonStatus", "sermon_slug"]
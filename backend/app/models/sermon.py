@@ -1,9 +1,11 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Enum, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
 
 from app.db.database import Base
+from app.utils import slugify
 
 
 class SermonStatus(str, enum.Enum):
@@ -15,7 +17,6 @@ class SermonStatus(str, enum.Enum):
 
 class Sermon(Base):
     __tablename__ = "sermons"
-
     id = Column(Integer, primary_key=True, index=True)
     church_id = Column(Integer, ForeignKey("churches.id"), nullable=False)
 
@@ -34,9 +35,9 @@ class Sermon(Base):
     audio_url = Column(String(500), nullable=True)
     duration_seconds = Column(Integer, nullable=True)
 
-    # Transcript (stored as JSON with timestamps)
-    # Format: [{"start": 0.0, "duration": 5.2, "text": "Welcome everyone..."}, ...]
-    transcript_json = Column(JSON, nullable=True)
+    # Transcript (stored as JSONB with timestamps, one array per field)
+    # Format: {"starts": [0.0, ...], "durations": [5.2, ...], "texts": ["Welcome everyone...", ...]}
+    transcript_json = Column(JSONB, nullable=True)
     # AI-formatted transcript with proper punctuation and paragraphs
     formatted_transcript = Column(Text, nullable=True)
 
@@ -61,15 +62,37 @@ class Sermon(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (
+        # Per-sermon routes join on church and filter by id
+        Index("ix_sermons_church_id_id", "church_id", "id"),
+        # Dashboard listing and church.sermons: a church's sermons, newest first
+        Index("ix_sermons_church_date", "church_id", sermon_date.desc()),
+        # Public feed query: published sermons for a church, newest first.
+        # Covers the columns it filters on so Postgres can scan it in order.
+        Index(
+            "ix_sermons_feed",
+            "church_id",
+            "status",
+            sermon_date.desc(),
+            postgresql_include=["audio_url", "title", "summary", "duration_seconds"]
+        ),
+    )
+
     # Relationships
     church = relationship("Church", back_populates="sermons")
 
     @property
     def slug(self) -> str:
         """Generate URL-friendly slug from title."""
-        import re
-        slug = self.title.lower()
-        slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-        slug = re.sub(r'[\s_]+', '-', slug)
-        slug = re.sub(r'-+', '-', slug)
-        return f"{slug}-{self.id}" if self.id else slug
+        return sermon_slug(self.title, self.id)
+
+
+def sermon_slug(title: str, sermon_id: int | None) -> str:
+    """
+    Generate URL-friendly slug from a sermon's title and id.
+
+    Kept as a plain function so column-only query rows can build the same
+    URLs as Sermon instances.
+    """
+    slug = slugify(title)
+    return f"{slug}-{sermon_id}" if sermon_id else slug
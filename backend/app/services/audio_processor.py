@@ -5,16 +5,21 @@ Extracts audio from YouTube videos using yt-dlp and normalizes with ffmpeg.
 Adapted from CWI script 02_extract_audio_v1.py for SaaS architecture.
 """
 
+import asyncio
 import logging
 import os
+import shutil
 import subprocess
 import tempfile
+from functools import lru_cache, partial
 from pathlib import Path
 from typing import Optional
 
+import google_crc32c
 from google.cloud import storage
 
 from app.config import get_settings
+from app.services.concurrency import gather_bounded
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -25,16 +30,33 @@ AUDIO_BITRATE = "128k"
 AUDIO_CHANNELS = 1  # Mono for speech
 SAMPLE_RATE = 44100
 
+# Resumable upload chunk size (must be a multiple of 256KB). Larger chunks
+# let the connection ramp up; a failed chunk is retried on its own.
+GCS_UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Upload checksums use google-crc32c; its pure-Python fallback takes
+# seconds of CPU per sermon instead of milliseconds
+if google_crc32c.implementation != "c":
+    logger.warning("google-crc32c C extension not available; upload checksums will be slow")
+
+# Downmix to mono before loudnorm, which upsamples internally to 192kHz,
+# so it processes one channel instead of two. -19 LUFS mono matches the
+# -16 LUFS stereo podcast standard the audio was normalized to before.
+AUDIO_FILTER = "aformat=channel_layouts=mono,loudnorm=I=-19:LRA=11:TP=-1.5"
+
 
 class AudioProcessorError(Exception):
     """Exception raised when audio processing fails."""
     pass
 
 
+@lru_cache(maxsize=1)
 def check_dependencies() -> dict:
     """
     Check if required tools (yt-dlp, ffmpeg) are available.
 
+    The result is cached for the life of the process.
+
     Returns:
         dict with 'yt_dlp' and 'ffmpeg' boolean status
     """
@@ -43,7 +65,8 @@ def check_dependencies() -> dict:
     try:
         subprocess.run(
             ["yt-dlp", "--version"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=True
         )
         result["yt_dlp"] = True
@@ -53,7 +76,8 @@ def check_dependencies() -> dict:
     try:
         subprocess.run(
             ["ffmpeg", "-version"],
-            capture_output=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             check=True
         )
         result["ffmpeg"] = True
@@ -68,7 +92,11 @@ def extract_audio_from_youtube(
     output_dir: Optional[Path] = None
 ) -> dict:
     """
-    Extract audio from a YouTube video.
+    Extract normalized MP3 audio from a YouTube video.
+
+    yt-dlp streams the best audio-only format into ffmpeg, which converts
+    it to MP3 and normalizes loudness in a single pass, so only the final
+    file is written to disk.
 
     Args:
         video_id: YouTube video ID
@@ -92,82 +120,36 @@ def extract_audio_from_youtube(
         output_dir.mkdir(parents=True, exist_ok=True)
 
     output_file = output_dir / f"{video_id}.{AUDIO_FORMAT}"
-
-    # yt-dlp options for audio extraction
+    duration_file = output_dir / f"{video_id}.duration"
+    duration_file.unlink(missing_ok=True)  # yt-dlp appends to it
+
+    # yt-dlp writes the source audio to stdout and the video's duration
+    # (from its metadata) to a side file, sparing an ffprobe run.
+    # It runs as a subprocess rather than in-process: the library can only
+    # download to a file (or our own stdout), which would serialize the
+    # download and the encode, and handing ffmpeg the media URL instead
+    # would lose yt-dlp's chunked downloading that avoids YouTube's
+    # throttling. Both cost far more than its ~0.5s startup.
     yt_dlp_cmd = [
         "yt-dlp",
-        "--extract-audio",
-        "--audio-format", AUDIO_FORMAT,
-        "--audio-quality", "0",  # Best quality before conversion
-        "--output", str(output_dir / f"{video_id}.%(ext)s"),
+        "--format", "bestaudio/best",
+        "--output", "-",
+        "--print-to-file", "%(duration)s", str(duration_file),
         "--no-playlist",
         "--no-warnings",
         "--quiet",
         youtube_url
     ]
 
-    logger.info(f"Extracting audio from {video_id}")
-
-    try:
-        result = subprocess.run(
-            yt_dlp_cmd,
-            capture_output=True,
-            text=True,
-            timeout=600  # 10 minute timeout
-        )
-
-        if result.returncode != 0:
-            error_msg = result.stderr or result.stdout or "Unknown error"
-            raise AudioProcessorError(f"yt-dlp failed: {error_msg}")
-
-    except subprocess.TimeoutExpired:
-        raise AudioProcessorError("Audio extraction timed out after 10 minutes")
-    except FileNotFoundError:
-        raise AudioProcessorError("yt-dlp not found. Install with: pip install yt-dlp")
-
-    # Check if file was created
-    if not output_file.exists():
-        # yt-dlp might have created file with different extension
-        possible_files = list(output_dir.glob(f"{video_id}.*"))
-        if possible_files:
-            # Convert to MP3 if needed
-            source_file = possible_files[0]
-            if source_file.suffix != f".{AUDIO_FORMAT}":
-                output_file = convert_to_mp3(source_file, output_file)
-                source_file.unlink()  # Remove original
-        else:
-            raise AudioProcessorError(f"Audio file not created for {video_id}")
-
-    # Normalize audio with ffmpeg
-    normalized_file = normalize_audio(output_file)
-
-    # Get duration and file size
-    duration = get_audio_duration(normalized_file)
-    file_size = normalized_file.stat().st_size
-
-    logger.info(f"Audio extracted: {normalized_file} ({duration}s, {file_size} bytes)")
-
-    return {
-        "file_path": normalized_file,
-        "duration_seconds": duration,
-        "file_size_bytes": file_size
-    }
-
-
-def convert_to_mp3(input_file: Path, output_file: Path) -> Path:
-    """
-    Convert audio file to MP3 format.
-
-    Args:
-        input_file: Source audio file
-        output_file: Destination MP3 file
-
-    Returns:
-        Path to converted file
-    """
+    # ffmpeg reads it from stdin, normalizes loudness for broadcast
+    # standards and encodes MP3
     ffmpeg_cmd = [
         "ffmpeg",
-        "-i", str(input_file),
+        "-hide_banner",
+        "-loglevel", "error",
+        "-i", "pipe:0",
+        "-vn",  # Skip any video track (the "best" format fallback is muxed)
+        "-af", AUDIO_FILTER,
         "-codec:a", "libmp3lame",
         "-b:a", AUDIO_BITRATE,
         "-ac", str(AUDIO_CHANNELS),
@@ -176,67 +158,70 @@ def convert_to_mp3(input_file: Path, output_file: Path) -> Path:
         str(output_file)
     ]
 
+    logger.info(f"Extracting audio from {video_id}")
+
     try:
-        subprocess.run(
-            ffmpeg_cmd,
-            capture_output=True,
-            check=True,
-            timeout=300
+        yt_dlp_proc = subprocess.Popen(
+            yt_dlp_cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
         )
-    except subprocess.CalledProcessError as e:
-        raise AudioProcessorError(f"FFmpeg conversion failed: {e.stderr}")
     except FileNotFoundError:
-        raise AudioProcessorError("ffmpeg not found")
-
-    return output_file
-
-
-def normalize_audio(input_file: Path) -> Path:
-    """
-    Normalize audio levels using ffmpeg loudnorm filter.
-
-    Args:
-        input_file: Audio file to normalize
-
-    Returns:
-        Path to normalized file (replaces original)
-    """
-    temp_file = input_file.with_suffix(".normalized.mp3")
-
-    # Two-pass loudness normalization for broadcast standards
-    # Target: -16 LUFS (podcast standard)
-    ffmpeg_cmd = [
-        "ffmpeg",
-        "-i", str(input_file),
-        "-af", "loudnorm=I=-16:LRA=11:TP=-1.5",
-        "-codec:a", "libmp3lame",
-        "-b:a", AUDIO_BITRATE,
-        "-ac", str(AUDIO_CHANNELS),
-        "-ar", str(SAMPLE_RATE),
-        "-y",
-        str(temp_file)
-    ]
+        raise AudioProcessorError("yt-dlp not found. Install with: pip install yt-dlp")
 
     try:
-        subprocess.run(
+        ffmpeg_proc = subprocess.Popen(
             ffmpeg_cmd,
-            capture_output=True,
-            check=True,
-            timeout=300
+            stdin=yt_dlp_proc.stdout,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE
         )
+    except FileNotFoundError:
+        yt_dlp_proc.kill()
+        yt_dlp_proc.wait()
+        raise AudioProcessorError("ffmpeg not found")
+    finally:
+        # ffmpeg holds its own copy; closing ours lets yt-dlp get SIGPIPE
+        # if ffmpeg exits early
+        yt_dlp_proc.stdout.close()
 
-        # Replace original with normalized version
-        temp_file.replace(input_file)
+    try:
+        _, ffmpeg_stderr = ffmpeg_proc.communicate(timeout=600)  # 10 minute timeout
+        _, yt_dlp_stderr = yt_dlp_proc.communicate(timeout=30)
+    except subprocess.TimeoutExpired:
+        for proc in (yt_dlp_proc, ffmpeg_proc):
+            proc.kill()
+            proc.wait()
+        raise AudioProcessorError("Audio extraction timed out after 10 minutes")
 
-    except subprocess.CalledProcessError as e:
-        # If normalization fails, keep original
-        logger.warning(f"Audio normalization failed: {e.stderr}")
-        if temp_file.exists():
-            temp_file.unlink()
-    except FileNotFoundError:
-        logger.warning("ffmpeg not found, skipping normalization")
+    # Either side failing usually breaks the other (truncated input or a
+    # broken pipe), so report both errors when both fail
+    yt_dlp_error = yt_dlp_stderr.decode(errors="replace").strip() or "Unknown error"
+    ffmpeg_error = ffmpeg_stderr.decode(errors="replace").strip() or "Unknown error"
+    ffmpeg_failed = ffmpeg_proc.returncode != 0 or not output_file.exists()
+
+    if yt_dlp_proc.returncode != 0:
+        if ffmpeg_failed:
+            raise AudioProcessorError(f"yt-dlp failed: {yt_dlp_error} (ffmpeg: {ffmpeg_error})")
+        raise AudioProcessorError(f"yt-dlp failed: {yt_dlp_error}")
+    if ffmpeg_failed:
+        raise AudioProcessorError(f"FFmpeg conversion failed: {ffmpeg_error}")
+
+    # Get duration (probing the file if yt-dlp didn't report one, e.g. for
+    # a past live stream) and file size
+    try:
+        duration = int(float(duration_file.read_text()))
+    except (OSError, ValueError):
+        duration = get_audio_duration(output_file)
+    file_size = output_file.stat().st_size
+
+    logger.info(f"Audio extracted: {output_file} ({duration}s, {file_size} bytes)")
 
-    return input_file
+    return {
+        "file_path": output_file,
+        "duration_seconds": duration,
+        "file_size_bytes": file_size
+    }
 
 
 def get_audio_duration(audio_file: Path) -> int:
@@ -269,6 +254,18 @@ def get_audio_duration(audio_file: Path) -> int:
         return 0
 
 
+@lru_cache(maxsize=1)
+def _get_gcs_client() -> storage.Client:
+    """Get the shared GCS client (credentials and HTTP session are reused)."""
+    return storage.Client(project=settings.gcs_project_id)
+
+
+@lru_cache()
+def get_gcs_bucket(bucket_name: str) -> storage.Bucket:
+    """Get a shared handle for a GCS bucket."""
+    return _get_gcs_client().bucket(bucket_name)
+
+
 def upload_to_gcs(
     local_file: Path,
     church_slug: str,
@@ -289,21 +286,23 @@ def upload_to_gcs(
         raise AudioProcessorError("GCS bucket not configured")
 
     try:
-        client = storage.Client(project=settings.gcs_project_id)
-        bucket = client.bucket(settings.gcs_bucket_name)
+        bucket = get_gcs_bucket(settings.gcs_bucket_name)
 
         # Organize by church: audio/{church_slug}/{video_id}.mp3
         blob_name = f"audio/{church_slug}/{video_id}.{AUDIO_FORMAT}"
-        blob = bucket.blob(blob_name)
-
-        # Upload with content type
-        blob.upload_from_filename(
-            str(local_file),
-            content_type="audio/mpeg"
-        )
-
-        # Make publicly accessible
-        blob.make_public()
+        blob = bucket.blob(blob_name, chunk_size=GCS_UPLOAD_CHUNK_SIZE)
+
+        # Stream the file in chunks with a resumable upload, verified
+        # end to end with CRC32C and publicly readable (set in the upload
+        # request itself rather than with a separate ACL call)
+        with open(local_file, "rb") as audio_file:
+            blob.upload_from_file(
+                audio_file,
+                size=local_file.stat().st_size,
+                content_type="audio/mpeg",
+                checksum="crc32c",
+                predefined_acl="publicRead"
+            )
 
         logger.info(f"Uploaded to GCS: {blob.public_url}")
         return blob.public_url
@@ -324,6 +323,9 @@ async def process_sermon_audio(
     3. Upload to cloud storage
     4. Clean up local files
 
+    The blocking subprocess and upload work runs in a thread, so the event
+    loop stays free while it runs.
+
     Args:
         video_id: YouTube video ID
         church_slug: Church slug for storage organization
@@ -336,12 +338,16 @@ async def process_sermon_audio(
     try:
         # Extract audio to temp directory
         temp_dir = Path(tempfile.mkdtemp())
-        extraction_result = extract_audio_from_youtube(video_id, temp_dir)
+        extraction_result = await asyncio.to_thread(
+            extract_audio_from_youtube, video_id, temp_dir
+        )
 
         local_file = extraction_result["file_path"]
 
         # Upload to cloud storage
-        audio_url = upload_to_gcs(local_file, church_slug, video_id)
+        audio_url = await asyncio.to_thread(
+            upload_to_gcs, local_file, church_slug, video_id
+        )
 
         return {
             "audio_url": audio_url,
@@ -352,5 +358,31 @@ async def process_sermon_audio(
     finally:
         # Clean up temp files
         if temp_dir and temp_dir.exists():
-            import shutil
             shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+async def process_sermon_audio_batch(
+    video_ids: list[str],
+    church_slug: str
+) -> dict[str, dict]:
+    """
+    Process audio for several sermons of one church concurrently.
+
+    At most settings.audio_workers sermons are processed at a time.
+
+    Args:
+        video_ids: YouTube video IDs
+        church_slug: Church slug for storage organization
+
+    Returns:
+        dict mapping each successfully processed video ID to its
+        process_sermon_audio result (see gather_bounded)
+    """
+    return await gather_bounded(
+        {
+            video_id: partial(process_sermon_audio, video_id, church_slug)
+            for video_id in video_ids
+        },
+        max_concurrency=settings.audio_workers,
+        description="Audio processing"
+    )
@@ -3,6 +3,7 @@ from typing import Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
@@ -11,6 +12,9 @@ from app.models import User
 settings = get_settings()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# OAuth state tokens only need to outlive the provider's consent screen
+OAUTH_STATE_EXPIRE_MINUTES = 10
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
@@ -43,14 +47,40 @@ def decode_token(token: str) -> Optional[dict]:
         return None
 
 
+def create_oauth_state(user_id: int, nonce: str) -> str:
+    """
+    Create a signed, short-lived OAuth state token.
+
+    Carries the user starting the flow so the provider callback can
+    attribute it without server-side session storage.
+    """
+    expire = datetime.utcnow() + timedelta(minutes=OAUTH_STATE_EXPIRE_MINUTES)
+    return jwt.encode(
+        {"uid": user_id, "nonce": nonce, "exp": expire},
+        settings.jwt_secret,
+        algorithm=settings.jwt_algorithm
+    )
+
+
+def decode_oauth_state(state: str) -> Optional[dict]:
+    """Decode and validate an OAuth state token."""
+    try:
+        payload = jwt.decode(state, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    except JWTError:
+        return None
+    if "uid" not in payload or "nonce" not in payload:
+        return None
+    return payload
+
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     """Get a user by email."""
-    return db.query(User).filter(User.email == email).first()
+    return db.scalar(select(User).where(User.email == email))
 
 
 def get_user_by_id(db: Session, user_id: int) -> Optional[User]:
     """Get a user by ID."""
-    return db.query(User).filter(User.id == user_id).first()
+    return db.scalar(select(User).where(User.id == user_id))
 
 
 def create_user(db: Session, email: str, password: str) -> User:
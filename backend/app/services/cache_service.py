@@ -0,0 +1,129 @@
+"""
+Cache Service
+Small Redis helpers for caching rendered responses and API results.
+
+Every helper fails open: if Redis is unreachable the caller just
+recomputes the value, so the cache can never take an endpoint down.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Optional
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Rendered podcast feeds (invalidated whenever feed content changes)
+FEED_CACHE_TTL = 900  # 15 minutes
+
+
+def feed_cache_key(church_slug: str, fmt: str = "xml") -> str:
+    """Cache key for a church's rendered feed in the given format."""
+    return f"feed:{church_slug}:{fmt}"
+
+
+# Feed validation results, keyed by a hash of the validated XML
+FEED_VALIDATION_CACHE_TTL = 3600  # 1 hour
+
+
+def feed_validation_cache_key(feed_digest: str) -> str:
+    """Cache key for the validation result of a feed with the given digest."""
+    return f"feedval:{feed_digest}"
+
+
+# YouTube channel info; subscriber/video counts may be a few minutes stale
+CHANNEL_INFO_CACHE_TTL = 600  # 10 minutes
+
+
+def channel_info_cache_key(channel_id: str) -> str:
+    """Cache key for a YouTube channel's info."""
+    return f"yt:channel:{channel_id}"
+
+
+# Channels' uploads playlist IDs, which don't change
+UPLOADS_PLAYLIST_CACHE_TTL = 7 * 24 * 3600  # 1 week
+
+
+def uploads_playlist_cache_key(channel_id: str) -> str:
+    """Cache key for a YouTube channel's uploads playlist ID."""
+    return f"yt:playlist:{channel_id}"
+
+
+# Pages of a channel's uploads playlist. Polls re-read the same first
+# page, so it is reused briefly; new uploads show up within the TTL
+UPLOADS_PAGE_CACHE_TTL = 300  # 5 minutes
+
+
+def uploads_page_cache_key(playlist_id: str, page_size: int, page_token: Optional[str]) -> str:
+    """Cache key for one page of a YouTube uploads playlist."""
+    return f"yt:uploads:{playlist_id}:{page_size}:{page_token or ''}"
+
+
+def access_token_cache_key(church_id: int) -> str:
+    """Cache key for a church's most recently refreshed YouTube access token."""
+    return f"yt:token:{church_id}"
+
+
+def oauth_nonce_cache_key(nonce: str) -> str:
+    """Cache key marking an OAuth state nonce as used."""
+    return f"oauth:nonce:{nonce}"
+
+
+# OpenAI responses, keyed by a hash of the full request; identical
+# requests (retries, reprocessing) don't hit the API again
+AI_RESPONSE_CACHE_TTL = 30 * 24 * 3600  # 30 days
+
+
+def ai_response_cache_key(request_digest: str) -> str:
+    """Cache key for the OpenAI response to a request with the given digest."""
+    return f"ai:{request_digest}"
+
+
+@lru_cache()
+def get_redis() -> Redis:
+    """Get the shared Redis client (connections are pooled by redis-py)."""
+    return Redis.from_url(
+        settings.redis_url,
+        socket_timeout=0.5,
+        socket_connect_timeout=0.5
+    )
+
+
+def cache_get(key: str) -> Optional[bytes]:
+    """Get a cached value, or None on a miss or Redis error."""
+    try:
+        return get_redis().get(key)
+    except RedisError as e:
+        logger.warning(f"Cache get failed for {key}: {e}")
+        return None
+
+
+def cache_set(key: str, value: bytes | str, ttl: int) -> None:
+    """Cache a value with a TTL in seconds, ignoring Redis errors."""
+    try:
+        get_redis().setex(key, ttl, value)
+    except RedisError as e:
+        logger.warning(f"Cache set failed for {key}: {e}")
+
+
+def cache_delete(*keys: str) -> None:
+    """Delete cached values, ignoring Redis errors."""
+    if not keys:
+        return
+    try:
+        get_redis().delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache delete failed for {keys}: {e}")
+
+
+def invalidate_feed_cache(church_slug: str) -> None:
+    """Drop a church's cached feeds after its sermons or settings change."""
+    cache_delete(*(
+        feed_cache_key(church_slug, fmt)
+        for fmt in ("xml", "xml:etag", "json", "json:etag")
+    ))
@@ -0,0 +1,49 @@
+"""
+Concurrency Helpers
+Shared helpers for running service calls concurrently.
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def gather_bounded(
+    calls: dict[str, Callable[[], Awaitable[T]]],
+    max_concurrency: int,
+    description: str
+) -> dict[str, T]:
+    """
+    Run several calls concurrently, at most max_concurrency at a time.
+
+    Args:
+        calls: Zero-argument coroutine functions (e.g. partials), by key
+        max_concurrency: Most calls in flight at once
+        description: What the calls do, for failure logs
+
+    Returns:
+        dict mapping each successful call's key to its result; failures
+        are logged and left out
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(call: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await call()
+
+    results = await asyncio.gather(
+        *(run(call) for call in calls.values()),
+        return_exceptions=True
+    )
+
+    succeeded = {}
+    for key, result in zip(calls, results):
+        if isinstance(result, Exception):
+            logger.error(f"{description} failed for {key}: {result}")
+        else:
+            succeeded[key] = result
+    return succeeded
@@ -9,15 +9,32 @@ Uses YouTube Data API v3 for:
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlencode
 
+import httpx
+import orjson
 import requests
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from requests.adapters import HTTPAdapter
+from sqlalchemy.orm import Session
+from urllib3.util.retry import Retry
 
 from app.config import get_settings
+from app.models import Church
+from app.services.cache_service import (
+    UPLOADS_PAGE_CACHE_TTL,
+    UPLOADS_PLAYLIST_CACHE_TTL,
+    access_token_cache_key,
+    cache_get,
+    cache_set,
+    uploads_page_cache_key,
+    uploads_playlist_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -31,12 +48,39 @@ YOUTUBE_SCOPES = [
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 
+# YouTube Data API (used directly by the async helpers)
+YOUTUBE_API_URL = "https://www.googleapis.com/youtube/v3"
+
+# Refresh access tokens this long before Google expires them
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
 
 class YouTubeServiceError(Exception):
     """Exception raised for YouTube API errors."""
     pass
 
 
+@lru_cache(maxsize=1)
+def _get_token_session() -> requests.Session:
+    """
+    Get the shared HTTP session for Google token requests.
+
+    Refreshes reuse pooled keep-alive connections instead of a new TLS
+    handshake each, and transient Google errors are retried with backoff
+    (refreshing twice is harmless, so POSTs are retried too).
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False
+    )
+    session.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=retries))
+    return session
+
+
 def get_oauth_url(redirect_uri: str, state: str) -> str:
     """
     Generate the Google OAuth authorization URL.
@@ -61,11 +105,16 @@ def get_oauth_url(redirect_uri: str, state: str) -> str:
     return f"{GOOGLE_AUTH_URL}?{urlencode(params)}"
 
 
-def exchange_code_for_tokens(code: str, redirect_uri: str) -> dict:
+async def exchange_code_for_tokens(
+    client: httpx.AsyncClient,
+    code: str,
+    redirect_uri: str
+) -> dict:
     """
     Exchange authorization code for access and refresh tokens.
 
     Args:
+        client: Shared async HTTP client
         code: Authorization code from OAuth callback
         redirect_uri: Same redirect URI used in authorization
 
@@ -83,7 +132,10 @@ def exchange_code_for_tokens(code: str, redirect_uri: str) -> dict:
         "grant_type": "authorization_code"
     }
 
-    response = requests.post(GOOGLE_TOKEN_URL, data=data)
+    try:
+        response = await client.post(GOOGLE_TOKEN_URL, data=data)
+    except httpx.HTTPError as e:
+        raise YouTubeServiceError(f"OAuth token exchange failed: {e}")
 
     if response.status_code != 200:
         error = response.json().get("error_description", "Token exchange failed")
@@ -112,7 +164,7 @@ def refresh_access_token(refresh_token: str) -> dict:
         "grant_type": "refresh_token"
     }
 
-    response = requests.post(GOOGLE_TOKEN_URL, data=data)
+    response = _get_token_session().post(GOOGLE_TOKEN_URL, data=data)
 
     if response.status_code != 200:
         error = response.json().get("error_description", "Token refresh failed")
@@ -121,10 +173,80 @@ def refresh_access_token(refresh_token: str) -> dict:
     return response.json()
 
 
+def token_expires_at(expires_in: Optional[int]) -> datetime:
+    """
+    Absolute expiry time for a token issued now.
+
+    Args:
+        expires_in: Token lifetime in seconds from Google (default 1 hour)
+
+    Returns:
+        UTC datetime at which the token expires
+    """
+    return datetime.utcnow() + timedelta(seconds=expires_in or 3600)
+
+
+def get_valid_access_token(db: Session, church: Church) -> str:
+    """
+    Get a usable access token for a church's YouTube connection.
+
+    The stored token is returned while it has more than TOKEN_REFRESH_MARGIN
+    left. Otherwise it is refreshed, and the new token and its absolute
+    expiry are saved on the church. Fresh tokens are also cached in Redis
+    until they near expiry, so concurrent requests that loaded the old token
+    reuse the first refresh instead of each calling Google.
+
+    Args:
+        db: Database session the church belongs to
+        church: Church with a connected YouTube channel
+
+    Returns:
+        Valid OAuth access token
+
+    Raises:
+        YouTubeServiceError: If the token needs refreshing and refresh fails
+    """
+    now = datetime.utcnow()
+    expires_at = church.youtube_token_expires_at
+    if church.youtube_access_token and expires_at and now < expires_at - TOKEN_REFRESH_MARGIN:
+        return church.youtube_access_token
+
+    if not church.youtube_refresh_token:
+        # Nothing to refresh with; let the API call report an invalid token
+        return church.youtube_access_token
+
+    cache_key = access_token_cache_key(church.id)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached.decode()
+
+    tokens = refresh_access_token(church.youtube_refresh_token)
+    church.youtube_access_token = tokens["access_token"]
+    church.youtube_token_expires_at = token_expires_at(tokens.get("expires_in"))
+    db.commit()
+
+    ttl = int((church.youtube_token_expires_at - TOKEN_REFRESH_MARGIN - now).total_seconds())
+    if ttl > 0:
+        cache_set(cache_key, church.youtube_access_token, ttl)
+
+    return church.youtube_access_token
+
+
+@lru_cache(maxsize=1)
+def _youtube_discovery_doc() -> bytes:
+    """Get the YouTube Data API discovery document bundled with the client library."""
+    return get_static_doc("youtube", "v3").encode()
+
+
 def get_youtube_client(access_token: str):
     """
     Create a YouTube API client with the given access token.
 
+    The discovery document is loaded once per process; each client gets
+    its own parsed copy, since the client library adds to it as resources
+    are used. Clients aren't shared because their HTTP connections aren't
+    thread-safe.
+
     Args:
         access_token: Valid OAuth access token
 
@@ -132,7 +254,7 @@ def get_youtube_client(access_token: str):
         YouTube API client
     """
     credentials = Credentials(token=access_token)
-    return build("youtube", "v3", credentials=credentials)
+    return build_from_document(orjson.loads(_youtube_discovery_doc()), credentials=credentials)
 
 
 def get_channel_info(access_token: str) -> dict:
@@ -160,18 +282,7 @@ def get_channel_info(access_token: str) -> dict:
         if not channels:
             raise YouTubeServiceError("No YouTube channel found for this account")
 
-        channel = channels[0]
-        snippet = channel.get("snippet", {})
-        statistics = channel.get("statistics", {})
-
-        return {
-            "channel_id": channel["id"],
-            "title": snippet.get("title", ""),
-            "description": snippet.get("description", ""),
-            "thumbnail_url": snippet.get("thumbnails", {}).get("default", {}).get("url"),
-            "subscriber_count": int(statistics.get("subscriberCount", 0)),
-            "video_count": int(statistics.get("videoCount", 0))
-        }
+        return _parse_channel_info(channels[0])
 
     except Exception as e:
         if "YouTubeServiceError" in str(type(e)):
@@ -179,6 +290,113 @@ def get_channel_info(access_token: str) -> dict:
         raise YouTubeServiceError(f"Failed to get channel info: {e}")
 
 
+async def fetch_channel_info(client: httpx.AsyncClient, access_token: str) -> dict:
+    """
+    Get the authenticated user's YouTube channel info without blocking.
+
+    Async counterpart of get_channel_info for async endpoints; calls the
+    Data API over the shared HTTP client instead of googleapiclient.
+
+    Args:
+        client: Shared async HTTP client
+        access_token: Valid OAuth access token
+
+    Returns:
+        dict with channel info (id, title, thumbnail_url, subscriber_count)
+
+    Raises:
+        YouTubeServiceError: If API call fails or no channel found
+    """
+    try:
+        response = await client.get(
+            f"{YOUTUBE_API_URL}/channels",
+            params={"part": "snippet,statistics", "mine": "true"},
+            headers={"Authorization": f"Bearer {access_token}"}
+        )
+    except httpx.HTTPError as e:
+        raise YouTubeServiceError(f"Failed to get channel info: {e}")
+
+    if response.status_code != 200:
+        raise YouTubeServiceError(f"Failed to get channel info: HTTP {response.status_code}")
+
+    channels = response.json().get("items", [])
+    if not channels:
+        raise YouTubeServiceError("No YouTube channel found for this account")
+
+    return _parse_channel_info(channels[0])
+
+
+def _parse_channel_info(channel: dict) -> dict:
+    """Flatten a channels.list item into a channel info dict."""
+    snippet = channel.get("snippet", {})
+    statistics = channel.get("statistics", {})
+
+    return {
+        "channel_id": channel["id"],
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "thumbnail_url": snippet.get("thumbnails", {}).get("default", {}).get("url"),
+        "subscriber_count": int(statistics.get("subscriberCount", 0)),
+        "video_count": int(statistics.get("videoCount", 0))
+    }
+
+
+def _get_uploads_playlist_id(youtube, channel_id: str) -> Optional[str]:
+    """
+    Get a channel's uploads playlist ID, cached in Redis.
+
+    Saves a channels.list call (and its quota) on every video listing.
+
+    Returns:
+        Playlist ID, or None if the channel doesn't exist
+    """
+    cache_key = uploads_playlist_cache_key(channel_id)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return cached.decode()
+
+    channel_response = youtube.channels().list(
+        part="contentDetails",
+        id=channel_id
+    ).execute()
+
+    channels = channel_response.get("items", [])
+    if not channels:
+        return None
+
+    uploads_playlist_id = channels[0]["contentDetails"]["relatedPlaylists"]["uploads"]
+    cache_set(cache_key, uploads_playlist_id, UPLOADS_PLAYLIST_CACHE_TTL)
+    return uploads_playlist_id
+
+
+def _get_uploads_page(
+    youtube,
+    playlist_id: str,
+    page_size: int,
+    page_token: Optional[str]
+) -> dict:
+    """
+    Get one page of an uploads playlist, cached briefly in Redis.
+
+    The raw API response is cached, so callers with different
+    published_after filters share it.
+    """
+    cache_key = uploads_page_cache_key(playlist_id, page_size, page_token)
+    cached = cache_get(cache_key)
+    if cached is not None:
+        return orjson.loads(cached)
+
+    playlist_response = youtube.playlistItems().list(
+        part="snippet",
+        playlistId=playlist_id,
+        maxResults=page_size,
+        pageToken=page_token
+    ).execute()
+
+    cache_set(cache_key, orjson.dumps(playlist_response), UPLOADS_PAGE_CACHE_TTL)
+    return playlist_response
+
+
 def list_channel_videos(
     access_token: str,
     channel_id: str,
@@ -193,36 +411,35 @@ def list_channel_videos(
         channel_id: YouTube channel ID
         max_results: Maximum number of videos to return
         published_after: Only return videos published after this date
+            (naive datetimes are taken as UTC)
 
     Returns:
-        List of video dicts with id, title, description, published_at, thumbnail_url
+        List of video dicts with id, title, description, published_at
+        (timezone-aware datetime) and thumbnail_url
     """
     youtube = get_youtube_client(access_token)
 
+    if published_after and published_after.tzinfo is None:
+        published_after = published_after.replace(tzinfo=timezone.utc)
+
     try:
         # First, get the channel's uploads playlist
-        channel_response = youtube.channels().list(
-            part="contentDetails",
-            id=channel_id
-        ).execute()
-
-        channels = channel_response.get("items", [])
-        if not channels:
+        uploads_playlist_id = _get_uploads_playlist_id(youtube, channel_id)
+        if not uploads_playlist_id:
             return []
 
-        uploads_playlist_id = channels[0]["contentDetails"]["relatedPlaylists"]["uploads"]
-
         # Get videos from uploads playlist
         videos = []
         next_page_token = None
+        reached_cutoff = False
 
         while len(videos) < max_results:
-            playlist_response = youtube.playlistItems().list(
-                part="snippet",
-                playlistId=uploads_playlist_id,
-                maxResults=min(50, max_results - len(videos)),
-                pageToken=next_page_token
-            ).execute()
+            playlist_response = _get_uploads_page(
+                youtube,
+                uploads_playlist_id,
+                min(50, max_results - len(videos)),
+                next_page_token
+            )
 
             for item in playlist_response.get("items", []):
                 snippet = item.get("snippet", {})
@@ -232,14 +449,17 @@ def list_channel_videos(
                 if published_at:
                     try:
                         pub_date = datetime.fromisoformat(published_at.replace("Z", "+00:00"))
-                        # Skip if before published_after filter
-                        if published_after and pub_date < published_after:
-                            continue
                     except ValueError:
                         pub_date = None
                 else:
                     pub_date = None
 
+                # Uploads are listed newest first, so once one is older than
+                # the cutoff, so is the rest of the playlist
+                if published_after and pub_date and pub_date < published_after:
+                    reached_cutoff = True
+                    break
+
                 videos.append({
                     "video_id": snippet.get("resourceId", {}).get("videoId"),
                     "title": snippet.get("title", ""),
@@ -249,7 +469,7 @@ def list_channel_videos(
                 })
 
             next_page_token = playlist_response.get("nextPageToken")
-            if not next_page_token:
+            if reached_cutoff or not next_page_token:
                 break
 
         return videos
@@ -259,6 +479,10 @@ def list_channel_videos(
         return []
 
 
+# videos.list accepts at most this many IDs per call
+VIDEOS_LIST_MAX_IDS = 50
+
+
 def get_video_details(access_token: str, video_id: str) -> Optional[dict]:
     """
     Get detailed information about a specific video.
@@ -270,69 +494,112 @@ def get_video_details(access_token: str, video_id: str) -> Optional[dict]:
     Returns:
         dict with video details or None if not found
     """
-    youtube = get_youtube_client(access_token)
+    return get_videos_details(access_token, [video_id]).get(video_id)
 
-    try:
-        response = youtube.videos().list(
+
+def get_videos_details(access_token: str, video_ids: list[str]) -> dict[str, dict]:
+    """
+    Get detailed information about several videos in batched API calls.
+
+    IDs are sent to videos.list up to VIDEOS_LIST_MAX_IDS at a time, which
+    costs one quota unit per call however many IDs it carries. When that
+    takes several calls, they go out together in one batch HTTP request.
+
+    Args:
+        access_token: Valid OAuth access token
+        video_ids: YouTube video IDs
+
+    Returns:
+        dict mapping video ID to video details; missing videos are omitted
+    """
+    youtube = get_youtube_client(access_token)
+    details = {}
+
+    def collect(request_id: str, response: dict, exception: Optional[Exception]):
+        if exception is not None:
+            logger.error(f"Failed to get video details for {request_id}: {exception}")
+            return
+        for video in response.get("items", []):
+            details[video["id"]] = _parse_video_details(video)
+
+    requests_by_ids = {}
+    for start in range(0, len(video_ids), VIDEOS_LIST_MAX_IDS):
+        chunk = video_ids[start:start + VIDEOS_LIST_MAX_IDS]
+        ids = ",".join(chunk)
+        requests_by_ids[ids] = youtube.videos().list(
             part="snippet,contentDetails,statistics",
-            id=video_id
-        ).execute()
+            id=ids
+        )
 
-        items = response.get("items", [])
-        if not items:
-            return None
-
-        video = items[0]
-        snippet = video.get("snippet", {})
-        content_details = video.get("contentDetails", {})
-        statistics = video.get("statistics", {})
-
-        # Parse duration (ISO 8601 format: PT1H2M3S)
-        duration_str = content_details.get("duration", "PT0S")
-        duration_seconds = parse_youtube_duration(duration_str)
-
-        return {
-            "video_id": video_id,
-            "title": snippet.get("title", ""),
-            "description": snippet.get("description", ""),
-            "published_at": snippet.get("publishedAt"),
-            "channel_id": snippet.get("channelId"),
-            "channel_title": snippet.get("channelTitle"),
-            "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url"),
-            "duration_seconds": duration_seconds,
-            "view_count": int(statistics.get("viewCount", 0)),
-            "like_count": int(statistics.get("likeCount", 0))
-        }
+    if len(requests_by_ids) == 1:
+        # A single call doesn't need the batch envelope
+        [(ids, request)] = requests_by_ids.items()
+        try:
+            collect(ids, request.execute(), None)
+        except Exception as e:
+            collect(ids, None, e)
+    elif requests_by_ids:
+        batch = youtube.new_batch_http_request(callback=collect)
+        for ids, request in requests_by_ids.items():
+            batch.add(request, request_id=ids)
+        try:
+            batch.execute()
+        except Exception as e:
+            logger.error(f"Failed to get video details batch: {e}")
+
+    return details
+
+
+def _parse_video_details(video: dict) -> dict:
+    """Flatten a videos.list item into a video details dict."""
+    snippet = video.get("snippet", {})
+    content_details = video.get("contentDetails", {})
+    statistics = video.get("statistics", {})
+
+    # Parse duration (ISO 8601 format: PT1H2M3S)
+    duration_str = content_details.get("duration", "PT0S")
+    duration_seconds = parse_youtube_duration(duration_str)
+
+    return {
+        "video_id": video["id"],
+        "title": snippet.get("title", ""),
+        "description": snippet.get("description", ""),
+        "published_at": snippet.get("publishedAt"),
+        "channel_id": snippet.get("channelId"),
+        "channel_title": snippet.get("channelTitle"),
+        "thumbnail_url": snippet.get("thumbnails", {}).get("high", {}).get("url"),
+        "duration_seconds": duration_seconds,
+        "view_count": int(statistics.get("viewCount", 0)),
+        "like_count": int(statistics.get("likeCount", 0))
+    }
 
-    except Exception as e:
-        logger.error(f"Failed to get video details for {video_id}: {e}")
-        return None
+
+# Seconds per unit designator in an ISO 8601 duration
+_DURATION_UNIT_SECONDS = {"D": 86400, "H": 3600, "M": 60, "S": 1}
 
 
 def parse_youtube_duration(duration_str: str) -> int:
     """
     Parse YouTube ISO 8601 duration to seconds.
 
+    A single pass over the characters (about twice as fast as a regex
+    match), which also handles the day part YouTube uses for videos over
+    24 hours ("P1DT2H3M").
+
     Args:
         duration_str: Duration string like "PT1H2M3S"
 
     Returns:
         Duration in seconds
     """
-    import re
-
-    # Match hours, minutes, seconds
-    pattern = r'PT(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?'
-    match = re.match(pattern, duration_str)
-
-    if not match:
-        return 0
-
-    hours = int(match.group(1) or 0)
-    minutes = int(match.group(2) or 0)
-    seconds = int(match.group(3) or 0)
-
-    return hours * 3600 + minutes * 60 + seconds
+    total = value = 0
+    for char in duration_str:
+        if "0" <= char <= "9":
+            value = value * 10 + ord(char) - 48
+        elif char in _DURATION_UNIT_SECONDS:
+            total += value * _DURATION_UNIT_SECONDS[char]
+            value = 0
+    return total
 
 
 async def poll_channel_for_new_videos(
@@ -0,0 +1,15 @@
+"""
+Shared text helpers.
+"""
+
+import re
+
+# Slug patterns: drop anything that isn't alphanumeric, whitespace or a
+# hyphen, then collapse runs of whitespace/hyphens into a single hyphen
+_SLUG_INVALID = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SEPARATORS = re.compile(r'[\s-]+')
+
+
+def slugify(text: str) -> str:
+    """Lowercase text and reduce it to alphanumerics joined by single hyphens."""
+    return _SLUG_SEPARATORS.sub('-', _SLUG_INVALID.sub('', text.lower()))
@@ -11,13 +11,14 @@ Pipeline Steps:
 6. Update database with results
 """
 
+import asyncio
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional
 
 from redis import Redis
 from rq import Queue
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app.config import get_settings
 from app.db.database import SessionLocal
@@ -26,10 +27,13 @@ from app.services.audio_processor import process_sermon_audio, AudioProcessorErr
 from app.services.transcript_service import get_sermon_transcript, TranscriptError
 from app.services.ai_extractor import (
     process_sermon_ai_content,
-    format_transcript,
+    format_transcript_async,
+    submit_ai_content_batch,
+    get_ai_content_batch_results,
     AIExtractorError
 )
-from app.services.pdf_generator import create_discussion_guide
+from app.services.pdf_generator import create_discussion_guide, create_discussion_guides_batch
+from app.services.cache_service import invalidate_feed_cache
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -42,6 +46,14 @@ high_priority_queue = Queue("high", connection=redis_conn)
 default_queue = Queue("default", connection=redis_conn)
 low_priority_queue = Queue("low", connection=redis_conn)
 
+# Pipeline job limits
+PIPELINE_JOB_TIMEOUT = "30m"  # 30 minute timeout
+PIPELINE_RESULT_TTL = 86400  # Keep result for 24 hours
+PIPELINE_FAILURE_TTL = 604800  # Keep failures for 7 days
+
+# How often to check on OpenAI batches submitted for AI content backfills
+AI_BATCH_POLL_INTERVAL = timedelta(minutes=15)
+
 
 def get_db() -> Session:
     """Get database session for worker tasks."""
@@ -54,20 +66,27 @@ def update_sermon_status(
     error_message: Optional[str] = None,
     **kwargs
 ):
-    """Update sermon status in database."""
-    db = get_db()
-    try:
-        sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
-        if sermon:
-            sermon.status = status.value
-            if error_message:
-                sermon.error_message = error_message
-            for key, value in kwargs.items():
-                if hasattr(sermon, key):
-                    setattr(sermon, key, value)
-            db.commit()
-    finally:
-        db.close()
+    """Update sermon status in database (one UPDATE, without loading the sermon)."""
+    values = {Sermon.status: status.value}
+    if error_message:
+        values[Sermon.error_message] = error_message
+    for key, value in kwargs.items():
+        if key in Sermon.__table__.columns:
+            values[getattr(Sermon, key)] = value
+
+    with SessionLocal() as db:
+        db.query(Sermon).filter(Sermon.id == sermon_id).update(values)
+        db.commit()
+
+
+def apply_ai_content(sermon: Sermon, ai_content: dict):
+    """Copy generated AI content onto a sermon's columns."""
+    sermon.summary = ai_content.get("summary")
+    sermon.big_idea = ai_content.get("big_idea")
+    sermon.primary_scripture = ai_content.get("primary_scripture")
+    sermon.topics = ai_content.get("topics", [])
+    sermon.discussion_guide_json = ai_content.get("discussion_guide")
+    sermon.ai_content_json = ai_content
 
 
 def process_sermon_pipeline(sermon_id: int):
@@ -79,17 +98,33 @@ def process_sermon_pipeline(sermon_id: int):
     
     Steps:
     1. Extract audio from YouTube → upload to GCS
-    2. Fetch transcript from YouTube
+    2. Fetch transcript from YouTube (at the same time as step 1)
     3. Format transcript with AI (punctuation, paragraphs)
     4. Generate AI content (summary, discussion guide content)
     5. Generate PDF discussion guide → upload to GCS
     6. Update sermon record with all results
     """
+    asyncio.run(_process_sermon_pipeline_async(sermon_id))
+
+
+async def _fetch_sermon_transcript(video_id: str) -> Optional[dict]:
+    """Fetch a sermon's transcript, or None if it has none."""
+    try:
+        return await get_sermon_transcript(video_id)
+    except TranscriptError as e:
+        logger.warning(f"Transcript fetch failed: {e}")
+        return None
+
+
+async def _process_sermon_pipeline_async(sermon_id: int):
+    """Run process_sermon_pipeline's steps on an event loop."""
     db = get_db()
     
     try:
-        # Get sermon record
-        sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
+        # Get sermon record (with its church, needed for the audio path)
+        sermon = db.query(Sermon).options(joinedload(Sermon.church)).filter(
+            Sermon.id == sermon_id
+        ).first()
         if not sermon:
             logger.error(f"Sermon {sermon_id} not found")
             return
@@ -104,42 +139,57 @@ def process_sermon_pipeline(sermon_id: int):
         sermon.processing_started_at = datetime.utcnow()
         db.commit()
         
-        # Step 1: Extract audio
-        logger.info(f"Step 1: Extracting audio for {video_id}")
+        # Steps 1 and 2: Extract audio and fetch transcript. Both mostly
+        # wait on YouTube, so they run together; an audio failure cancels
+        # the transcript fetch
+        logger.info(f"Steps 1-2: Extracting audio and fetching transcript for {video_id}")
+        audio_error = None
         try:
-            audio_result = process_sermon_audio(video_id, church.slug)
-            sermon.audio_url = audio_result["audio_url"]
-            sermon.duration_seconds = audio_result["duration_seconds"]
-            db.commit()
-            logger.info(f"Audio extracted: {audio_result['audio_url']}")
-        except AudioProcessorError as e:
-            logger.error(f"Audio extraction failed: {e}")
+            async with asyncio.TaskGroup() as task_group:
+                audio_task = task_group.create_task(
+                    process_sermon_audio(video_id, church.slug)
+                )
+                transcript_task = task_group.create_task(
+                    _fetch_sermon_transcript(video_id)
+                )
+        except* AudioProcessorError as error_group:
+            audio_error = error_group.exceptions[0]
+        except* Exception as error_group:
+            # Anything else fails the pipeline; unwrap it so the sermon's
+            # error message is the real error, not the group
+            raise error_group.exceptions[0]
+        
+        if audio_error:
+            logger.error(f"Audio extraction failed: {audio_error}")
             sermon.status = SermonStatus.FAILED.value
-            sermon.error_message = f"Audio extraction failed: {e}"
+            sermon.error_message = f"Audio extraction failed: {audio_error}"
             db.commit()
             return
         
-        # Step 2: Fetch transcript
-        logger.info(f"Step 2: Fetching transcript for {video_id}")
-        try:
-            transcript_result = get_sermon_transcript(video_id)
+        audio_result = audio_task.result()
+        transcript_result = transcript_task.result()
+        
+        sermon.audio_url = audio_result["audio_url"]
+        sermon.duration_seconds = audio_result["duration_seconds"]
+        if transcript_result:
             raw_transcript = transcript_result["full_text"]
             sermon.transcript_json = transcript_result["entries_json"]
-            db.commit()
-            logger.info(f"Transcript fetched: {transcript_result['word_count']} words")
-        except TranscriptError as e:
-            logger.warning(f"Transcript fetch failed: {e}")
-            raw_transcript = None
+        else:
             # Continue without transcript - audio is still valuable
+            raw_transcript = None
+        db.commit()
+        
+        logger.info(f"Audio extracted: {audio_result['audio_url']}")
+        if transcript_result:
+            logger.info(f"Transcript fetched: {transcript_result['word_count']} words")
         
         # Step 3: Format transcript with AI
         if raw_transcript:
             logger.info(f"Step 3: Formatting transcript for {video_id}")
             try:
-                formatted_transcript = format_transcript(raw_transcript)
+                formatted_transcript = await format_transcript_async(raw_transcript)
                 # Store formatted version
                 sermon.formatted_transcript = formatted_transcript
-                db.commit()
                 logger.info("Transcript formatted")
             except Exception as e:
                 logger.warning(f"Transcript formatting failed: {e}")
@@ -151,18 +201,12 @@ def process_sermon_pipeline(sermon_id: int):
         if formatted_transcript:
             logger.info(f"Step 4: Generating AI content for {video_id}")
             try:
-                ai_content = process_sermon_ai_content(
+                ai_content = await process_sermon_ai_content(
                     transcript_text=formatted_transcript,
                     title=sermon.title,
                     video_id=video_id
                 )
-                sermon.summary = ai_content.get("summary")
-                sermon.big_idea = ai_content.get("big_idea")
-                sermon.primary_scripture = ai_content.get("primary_scripture")
-                sermon.topics = ai_content.get("topics", [])
-                sermon.discussion_guide_json = ai_content.get("discussion_guide")
-                sermon.ai_content_json = ai_content
-                db.commit()
+                apply_ai_content(sermon, ai_content)
                 logger.info("AI content generated")
             except AIExtractorError as e:
                 logger.warning(f"AI content generation failed: {e}")
@@ -174,7 +218,7 @@ def process_sermon_pipeline(sermon_id: int):
         if ai_content and ai_content.get("discussion_guide"):
             logger.info(f"Step 5: Generating discussion guide PDF for {video_id}")
             try:
-                pdf_result = create_discussion_guide(
+                pdf_result = await create_discussion_guide(
                     ai_content=ai_content,
                     church_name=church.name,
                     church_slug=church.slug,
@@ -184,15 +228,16 @@ def process_sermon_pipeline(sermon_id: int):
                     speaker=sermon.speaker
                 )
                 sermon.discussion_guide_url = pdf_result["pdf_url"]
-                db.commit()
                 logger.info(f"Discussion guide created: {pdf_result['pdf_url']}")
             except Exception as e:
                 logger.warning(f"Discussion guide generation failed: {e}")
         
-        # Mark as published
+        # Mark as published, saving steps 3-5 in the same commit (if the
+        # pipeline fails first, the failure handler commits them)
         sermon.status = SermonStatus.PUBLISHED.value
         sermon.published_at = datetime.utcnow()
         db.commit()
+        invalidate_feed_cache(church.slug)
         
         logger.info(f"Sermon {sermon_id} processing complete!")
         
@@ -210,6 +255,15 @@ def process_sermon_pipeline(sermon_id: int):
         db.close()
 
 
+def _get_queue(priority: str) -> Queue:
+    """Get the task queue for a priority name (default if unknown)."""
+    return {
+        "high": high_priority_queue,
+        "default": default_queue,
+        "low": low_priority_queue
+    }.get(priority, default_queue)
+
+
 def enqueue_sermon_processing(sermon_id: int, priority: str = "default"):
     """
     Add sermon to processing queue.
@@ -218,36 +272,161 @@ def enqueue_sermon_processing(sermon_id: int, priority: str = "default"):
         sermon_id: Database ID of sermon to process
         priority: Queue priority (high, default, low)
     """
-    queue = {
-        "high": high_priority_queue,
-        "default": default_queue,
-        "low": low_priority_queue
-    }.get(priority, default_queue)
+    queue = _get_queue(priority)
     
     job = queue.enqueue(
         process_sermon_pipeline,
         sermon_id,
-        job_timeout="30m",  # 30 minute timeout
-        result_ttl=86400,   # Keep result for 24 hours
-        failure_ttl=604800  # Keep failures for 7 days
+        job_timeout=PIPELINE_JOB_TIMEOUT,
+        result_ttl=PIPELINE_RESULT_TTL,
+        failure_ttl=PIPELINE_FAILURE_TTL
     )
     
     logger.info(f"Enqueued sermon {sermon_id} for processing (job: {job.id})")
     return job.id
 
 
+def enqueue_sermons_processing(sermon_ids: list[int], priority: str = "default") -> list[str]:
+    """
+    Add several sermons to the processing queue at once.
+
+    All jobs are written in a single Redis pipeline, so enqueueing N
+    sermons costs one round trip instead of N.
+
+    Args:
+        sermon_ids: Database IDs of sermons to process
+        priority: Queue priority (high, default, low)
+
+    Returns:
+        Job IDs, in the same order as sermon_ids
+    """
+    queue = _get_queue(priority)
+
+    jobs = queue.enqueue_many([
+        Queue.prepare_data(
+            process_sermon_pipeline,
+            args=(sermon_id,),
+            timeout=PIPELINE_JOB_TIMEOUT,
+            result_ttl=PIPELINE_RESULT_TTL,
+            failure_ttl=PIPELINE_FAILURE_TTL
+        )
+        for sermon_id in sermon_ids
+    ])
+
+    logger.info(f"Enqueued {len(jobs)} sermons for processing")
+    return [job.id for job in jobs]
+
+
 def reprocess_failed_sermon(sermon_id: int):
     """
     Requeue a failed sermon for reprocessing.
     Resets status and enqueues again.
     """
-    db = get_db()
-    try:
-        sermon = db.query(Sermon).filter(Sermon.id == sermon_id).first()
-        if sermon:
-            sermon.status = SermonStatus.PENDING.value
-            sermon.error_message = None
+    with SessionLocal() as db:
+        updated = db.query(Sermon).filter(Sermon.id == sermon_id).update({
+            Sermon.status: SermonStatus.PENDING.value,
+            Sermon.error_message: None
+        })
+        db.commit()
+
+    # Enqueue only after the reset is committed, so the worker can't
+    # start on the sermon before it
+    if updated:
+        return enqueue_sermon_processing(sermon_id)
+
+
+def backfill_sermon_ai_content(sermon_ids: list[int]) -> Optional[str]:
+    """
+    Regenerate AI content for many sermons through the OpenAI Batch API.
+
+    For bulk reprocessing (e.g. a church's back catalog) where results can
+    wait: batch requests cost half as much as the live pipeline's calls.
+    Only sermons with a formatted transcript are included. A low-priority
+    job collects the results once the batch completes.
+
+    Returns:
+        OpenAI batch ID, or None if no sermon had a transcript
+    """
+    with SessionLocal() as db:
+        sermons = db.query(Sermon).filter(
+            Sermon.id.in_(sermon_ids),
+            Sermon.formatted_transcript.isnot(None)
+        ).all()
+        jobs = [
+            {
+                "custom_id": str(sermon.id),
+                "transcript_text": sermon.formatted_transcript,
+                "title": sermon.title
+            }
+            for sermon in sermons
+        ]
+
+    if not jobs:
+        logger.info("No sermons with transcripts to backfill")
+        return None
+
+    batch_id = submit_ai_content_batch(jobs)
+    low_priority_queue.enqueue_in(AI_BATCH_POLL_INTERVAL, collect_sermon_ai_batch, batch_id)
+    return batch_id
+
+
+def collect_sermon_ai_batch(batch_id: str):
+    """
+    Save the results of an AI content backfill batch.
+
+    Re-enqueues itself while the batch is still running, so no worker is
+    tied up waiting on it. Discussion guide PDFs are re-rendered from the
+    new content; until a sermon's new PDF is uploaded its old one is
+    unlinked, so a stale guide is never served.
+    """
+    results = get_ai_content_batch_results(batch_id)
+    if results is None:
+        low_priority_queue.enqueue_in(AI_BATCH_POLL_INTERVAL, collect_sermon_ai_batch, batch_id)
+        return
+
+    ai_contents = {int(custom_id): content for custom_id, content in results}
+    guides = []
+    sermon_ids_by_video = {}
+
+    with SessionLocal() as db:
+        sermons = db.query(Sermon).options(joinedload(Sermon.church)).filter(
+            Sermon.id.in_(ai_contents)
+        ).all()
+        for sermon in sermons:
+            ai_content = ai_contents[sermon.id]
+            ai_content["video_id"] = sermon.youtube_video_id
+            ai_content["title"] = sermon.title
+            ai_content["ai_generated"] = True
+            apply_ai_content(sermon, ai_content)
+            sermon.discussion_guide_url = None
+
+            if ai_content.get("discussion_guide"):
+                guides.append({
+                    "ai_content": ai_content,
+                    "church_name": sermon.church.name,
+                    "church_slug": sermon.church.slug,
+                    "sermon_title": sermon.title,
+                    "video_id": sermon.youtube_video_id,
+                    "sermon_date": sermon.sermon_date.strftime("%B %d, %Y") if sermon.sermon_date else None,
+                    "speaker": sermon.speaker
+                })
+                sermon_ids_by_video[sermon.youtube_video_id] = sermon.id
+        db.commit()
+
+        for church_slug in {sermon.church.slug for sermon in sermons}:
+            invalidate_feed_cache(church_slug)
+
+    logger.info(f"Saved AI content from batch {batch_id} for {len(sermons)} sermons")
+
+    # Render outside the session, so no transaction stays open meanwhile
+    created = asyncio.run(create_discussion_guides_batch(guides)) if guides else {}
+
+    if created:
+        with SessionLocal() as db:
+            for video_id, pdf_result in created.items():
+                db.query(Sermon).filter(Sermon.id == sermon_ids_by_video[video_id]).update({
+                    Sermon.discussion_guide_url: pdf_result["pdf_url"]
+                })
             db.commit()
-            return enqueue_sermon_processing(sermon_id)
-    finally:
-        db.close()
+
+    logger.info(f"Re-created {len(created)} of {len(guides)} discussion guides from batch {batch_id}")